@@ -10,7 +10,7 @@ __all__ = [
     'GAME_PACKAGE', 'GAME_ACTIVITY',
 
     # Пути и директории
-    'BASE_DIR', 'IMAGES_DIR', 'IMAGE_PATHS',
+    'BASE_DIR', 'IMAGES_DIR', 'IMAGE_PATHS', 'SKIP_TEMPLATES_DIR',
 
     # Координаты и области
     'COORDINATES', 'OCR_REGIONS', 'SEASONS',
@@ -10,6 +10,7 @@ from pathlib import Path
 BASE_DIR = Path(__file__).parent.parent.absolute()
 IMAGES_DIR = BASE_DIR / 'images'
 LOGS_DIR = BASE_DIR / 'logs'
+SKIP_TEMPLATES_DIR = IMAGES_DIR / 'skip_templates'  # Шаблоны кнопки ПРОПУСТИТЬ (снимаются в режиме отладки)
 
 # Создаем директории если их нет
 IMAGES_DIR.mkdir(exist_ok=True)
@@ -180,6 +181,9 @@ PAUSE_SETTINGS = {
     'after_server_click': 1.5,
     'after_server_scroll': 1.5,
     'between_tutorial_steps': 1.0,
+    # Паузы вокруг клика не длиннее этой выполняются на устройстве вместе с кликом
+    # (серии кликов, ожидание после клика); на устройстве пауза не прерывается отменой
+    'max_batched_click_pause': 2.0,
 }
 
 # Настройки для распознавания изображений
@@ -200,6 +204,9 @@ SERVER_RECOGNITION_SETTINGS = {
 # Настройки для OCR
 OCR_SETTINGS = {
     'language': 'rus+eng',
+    # Для кнопки ПРОПУСТИТЬ достаточно одной русской модели (латиница в ней тоже есть),
+    # вторая модель удваивает время распознавания на каждой попытке
+    'skip_button_language': 'rus',
     'config': '--psm 6 -c tessedit_char_whitelist=0123456789#№Море ',
     'threshold_binary': 150,
     'threshold_adaptive_block_size': 11,
@@ -7,6 +7,9 @@ import cv2
 import random
 import logging
 import subprocess
+import struct
+import threading
+import queue
 import os
 import tempfile
 from io import BytesIO
@@ -16,6 +19,9 @@ from config import DEFAULT_TIMEOUT, LOADING_TIMEOUT, GAME_PACKAGE, GAME_ACTIVITY
 class ADBController:
     """Класс для взаимодействия с устройством через ADB."""
 
+    # Ошибок сырого screencap подряд (полного или с обрезкой), после которых этот путь больше не используется
+    RAW_SCREENCAP_MAX_FAILURES = 3
+
     def __init__(self, host='127.0.0.1', port=5037, device_name=None):
         """
         Инициализация контроллера ADB.
@@ -29,6 +35,16 @@ class ADBController:
         self.host = host
         self.port = port
         self.device_name = device_name
+        self.raw_screencap_supported = True  # Сбрасывается, если устройство отдает неизвестный формат
+        self._raw_screencap_failures = 0  # Ошибки сырого screencap подряд
+        self.region_screencap_supported = True  # Сбрасывается, если обрезка на устройстве не работает
+        self._region_screencap_failures = 0  # Ошибки обрезки на устройстве подряд
+        self.raw_geometry = None  # (ширина, высота, размер заголовка) сырого screencap
+
+        # Постоянная сессия `adb shell` для команд ввода (создается при первом клике)
+        self._input_shell = None
+        self._input_lines = None
+        self._input_shell_lock = threading.Lock()
 
         # Попытка подключения к устройству
         self.logger.info("Поиск подключенных устройств...")
@@ -97,6 +113,148 @@ class ADBController:
             self.logger.error(f"Stderr: {e.stderr}")
             raise
 
+    # Строка, которую сессия печатает после выполнения команды (за ней - код возврата)
+    INPUT_SHELL_MARKER = '__sea_conquest_bot_done__'
+
+    # Время ожидания выполнения команды ввода сверх ее собственных пауз, в секундах
+    INPUT_SHELL_TIMEOUT = 10.0
+
+    # Отметка выполненного клика в выводе серии кликов
+    TAP_DONE_MARKER = '__tap_done__'
+
+    def _start_input_shell(self):
+        """
+        Запуск постоянной сессии `adb shell`, в которую пишутся команды ввода.
+
+        Вывод сессии читает отдельный поток в свою очередь строк: ожидание
+        результата команды ограничено по времени на любой платформе.
+        """
+        cmd = ['adb']
+        if self.device_serial:
+            cmd.extend(['-s', self.device_serial])
+        cmd.append('shell')
+
+        shell = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                 stderr=subprocess.DEVNULL, text=True, bufsize=1)
+        lines = queue.Queue()
+        threading.Thread(target=self._read_input_shell, args=(shell.stdout, lines),
+                         name="adb_input_shell_reader", daemon=True).start()
+
+        self._input_shell = shell
+        self._input_lines = lines
+
+    @staticmethod
+    def _read_input_shell(stdout, lines):
+        """
+        Цикл потока чтения вывода сессии: строки в очередь, None - сессия закрыта.
+
+        Args:
+            stdout: поток вывода процесса сессии
+            lines: очередь строк этой сессии
+        """
+        try:
+            for line in stdout:
+                lines.put(line)
+        except (OSError, ValueError):
+            pass
+        lines.put(None)
+
+    def _stop_input_shell(self):
+        """Завершение постоянной сессии `adb shell`."""
+        shell, self._input_shell = self._input_shell, None
+        self._input_lines = None
+        if shell is None:
+            return
+        try:
+            shell.stdin.close()
+            shell.wait(timeout=1)
+        except Exception:
+            shell.kill()
+
+    def shell_input(self, command, timeout=None):
+        """
+        Выполнение shell-команды ввода в постоянной сессии `adb shell`.
+
+        Новый процесс adb не запускается на каждый клик: команда пишется в уже
+        открытую сессию, а возврат происходит после ее выполнения на устройстве.
+        Отдельным вызовом ADB команда выполняется, только если сессию не удалось
+        запустить: отправленная команда могла уже выполниться и не повторяется.
+
+        Args:
+            command: shell-команда (например, "input tap 100 200")
+            timeout: время ожидания выполнения в секундах (по умолчанию INPUT_SHELL_TIMEOUT)
+
+        Returns:
+            str: вывод команды
+
+        Raises:
+            subprocess.CalledProcessError: команда завершилась с ошибкой
+            TimeoutError: команда не выполнилась за отведенное время
+            ConnectionError: сессия adb shell закрылась во время выполнения
+        """
+        if timeout is None:
+            timeout = self.INPUT_SHELL_TIMEOUT
+
+        with self._input_shell_lock:
+            if self._input_shell is None or self._input_shell.poll() is not None:
+                try:
+                    self._start_input_shell()
+                except OSError as e:
+                    self.logger.debug(f"Постоянная сессия adb shell недоступна, отдельный вызов ADB: {e}")
+                    self._stop_input_shell()
+                    return self.execute_adb_command('shell', command)
+
+            shell, lines = self._input_shell, self._input_lines
+            try:
+                try:
+                    shell.stdin.write(f"{command}; echo {self.INPUT_SHELL_MARKER} $?\n")
+                    shell.stdin.flush()
+                except OSError as e:
+                    raise ConnectionError(f"сессия adb shell закрыта: {e}") from e
+                status, output = self._wait_input_status(lines, time.time() + timeout)
+            except (TimeoutError, ConnectionError) as e:
+                # Зависшую или закрытую сессию не используем: следующая команда запустит новую
+                self.logger.error(f"Ошибка выполнения команды ADB в сессии adb shell: {e}")
+                self._stop_input_shell()
+                raise
+
+        if status != 0:
+            self.logger.error(f"Ошибка при выполнении команды ADB: '{command}' завершилась с кодом {status}")
+            raise subprocess.CalledProcessError(status, ['adb', 'shell', command], output=output)
+        return output
+
+    def _wait_input_status(self, lines, deadline):
+        """
+        Ожидание маркера выполнения команды в выводе сессии.
+
+        Args:
+            lines: очередь строк сессии
+            deadline: момент (time.time()), после которого ожидание прекращается
+
+        Returns:
+            tuple: (код возврата команды, вывод команды)
+        """
+        output = []
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                raise TimeoutError("команда не выполнилась вовремя")
+            try:
+                line = lines.get(timeout=remaining)
+            except queue.Empty:
+                raise TimeoutError("команда не выполнилась вовремя") from None
+
+            if line is None:
+                raise ConnectionError("сессия adb shell закрыта")
+            if line.startswith(self.INPUT_SHELL_MARKER):
+                return int(line.split()[-1]), ''.join(output).strip()
+            output.append(line)
+
+    def close(self):
+        """Освобождение ресурсов (постоянная сессия adb shell)."""
+        with self._input_shell_lock:
+            self._stop_input_shell()
+
     def tap(self, x, y):
         """
         Выполнение клика по координатам.
@@ -106,9 +264,41 @@ class ADBController:
             y: координата y
         """
         self.logger.debug(f"Клик по координатам: ({x}, {y})")
-        self.execute_adb_command('shell', 'input', 'tap', str(x), str(y))
+        self.shell_input(f"input tap {x} {y}")
         # Удаляем задержку time.sleep(DEFAULT_TIMEOUT)
 
+    def tap_sequence(self, points, pause_after=0.0):
+        """
+        Выполнение серии кликов одним вызовом ADB.
+        Паузы выполняются на устройстве, поэтому процесс adb запускается один раз.
+
+        Args:
+            points: список (x, y, пауза перед кликом в секундах)
+            pause_after: пауза после последнего клика в секундах
+
+        Raises:
+            subprocess.CalledProcessError: клик не выполнен, следующие клики серии не запускались;
+                атрибут taps_done - число кликов, выполненных до ошибки
+        """
+        commands = []
+        for x, y, pause in points:
+            if pause > 0:
+                commands.append(f"sleep {pause:g}")
+            # После каждого клика печатается отметка: по ним видно, где серия прервалась
+            commands.append(f"input tap {int(x)} {int(y)}")
+            commands.append(f"echo {self.TAP_DONE_MARKER}")
+        if pause_after > 0:
+            commands.append(f"sleep {pause_after:g}")
+
+        # Паузы на устройстве входят во время выполнения команды
+        pauses = sum(pause for _, _, pause in points) + pause_after
+        self.logger.debug(f"Серия из {len(points)} кликов: {points}")
+        try:
+            self.shell_input(' && '.join(commands), timeout=self.INPUT_SHELL_TIMEOUT + pauses)
+        except subprocess.CalledProcessError as e:
+            e.taps_done = (e.output or '').split().count(self.TAP_DONE_MARKER)
+            raise
+
     def tap_random(self, center_x, center_y, radius=50):
         """
         Выполнение клика по случайным координатам в заданной области.
@@ -137,10 +327,7 @@ class ADBController:
             duration: продолжительность свайпа в миллисекундах
         """
         self.logger.debug(f"Свайп от ({start_x}, {start_y}) к ({end_x}, {end_y})")
-        self.execute_adb_command('shell', 'input', 'swipe',
-                                 str(start_x), str(start_y),
-                                 str(end_x), str(end_y),
-                                 str(duration))
+        self.shell_input(f"input swipe {start_x} {start_y} {end_x} {end_y} {duration}")
         # Удаляем задержку time.sleep(DEFAULT_TIMEOUT)
 
     def complex_swipe(self, points, total_duration=2000):
@@ -173,7 +360,7 @@ class ADBController:
             key_code: код клавиши
         """
         self.logger.debug(f"Отправка события клавиши: {key_code}")
-        self.execute_adb_command('shell', 'input', 'keyevent', str(key_code))
+        self.shell_input(f"input keyevent {key_code}")
         # Удаляем задержку time.sleep(DEFAULT_TIMEOUT)
 
     def press_esc(self):
@@ -181,6 +368,114 @@ class ADBController:
         self.logger.debug("Нажатие ESC")
         self.key_event(4)  # KEYCODE_BACK
 
+    def screenshot_raw(self):
+        """
+        Получение скриншота в сыром формате screencap (без PNG-кодирования на устройстве).
+
+        Вывод `screencap` без `-p` - заголовок (ширина, высота, формат[, цветовое пространство])
+        и пиксели RGBA, которые напрямую превращаются в массив numpy без декодирования.
+
+        Returns:
+            numpy.ndarray: изображение в формате OpenCV (BGR) или None, если получить не удалось
+        """
+        if not self.raw_screencap_supported:
+            return None
+
+        try:
+            raw = self.execute_adb_command('exec-out', 'screencap', binary_output=True)
+            width, height, pixel_format = struct.unpack_from('<III', raw)
+            pixels_size = width * height * 4
+            header_size = len(raw) - pixels_size
+
+            # Формат 1/2 - RGBA_8888/RGBX_8888; заголовок 12 байт (16 на Android 9+)
+            if pixel_format not in (1, 2) or header_size not in (12, 16):
+                self.logger.warning(
+                    f"Неподдерживаемый сырой формат screencap (формат {pixel_format}, "
+                    f"заголовок {header_size} байт), используется PNG"
+                )
+                self.raw_screencap_supported = False
+                return None
+
+            self.raw_geometry = (width, height, header_size)
+            rgba = np.frombuffer(raw, dtype=np.uint8, count=pixels_size, offset=header_size)
+            image = cv2.cvtColor(rgba.reshape(height, width, 4), cv2.COLOR_RGBA2BGR)
+            self._raw_screencap_failures = 0
+            return image
+
+        except Exception as e:
+            self.logger.debug(f"Ошибка при получении сырого скриншота: {e}")
+
+            # Устройство, на котором сырой screencap не работает, не должно платить
+            # лишний вызов ADB перед PNG на каждом скриншоте
+            self._raw_screencap_failures += 1
+            if self._raw_screencap_failures >= self.RAW_SCREENCAP_MAX_FAILURES:
+                self.logger.warning("Сырой screencap не работает на устройстве, используется PNG")
+                self.raw_screencap_supported = False
+            return None
+
+    def screenshot_region(self, x, y, w, h):
+        """
+        Получение области экрана с обрезкой на устройстве.
+
+        Из сырого вывода screencap на устройстве вырезаются только строки y..y+h,
+        так что по ADB передается полоса экрана, а не весь кадр. Обрезка по x - на хосте.
+
+        Args:
+            x: левая граница области
+            y: верхняя граница области
+            w: ширина области
+            h: высота области
+
+        Returns:
+            numpy.ndarray: область экрана (BGR) или None, если получить не удалось
+        """
+        if not self.region_screencap_supported:
+            return None
+
+        # Для расчета смещения нужны размеры кадра и заголовка - берем их из полного снимка
+        if self.raw_geometry is None and self.screenshot_raw() is None:
+            return None
+
+        width, height, header_size = self.raw_geometry
+        x = max(0, x)
+        y = max(0, y)
+        w = min(width - x, w)
+        h = min(height - y, h)
+        if w <= 0 or h <= 0:
+            return None
+
+        row_size = width * 4
+        offset = header_size + y * row_size
+        count = h * row_size
+
+        try:
+            raw = self.execute_adb_command(
+                'exec-out', f"screencap | tail -c +{offset + 1} | head -c {count}",
+                binary_output=True
+            )
+            if len(raw) != count:
+                self.logger.warning(
+                    f"Обрезка скриншота на устройстве вернула {len(raw)} байт вместо {count}, "
+                    f"используется полный снимок"
+                )
+                self.region_screencap_supported = False
+                return None
+
+            rows = np.frombuffer(raw, dtype=np.uint8).reshape(h, width, 4)
+            self._region_screencap_failures = 0
+            return cv2.cvtColor(rows[:, x:x + w], cv2.COLOR_RGBA2BGR)
+
+        except Exception as e:
+            self.logger.debug(f"Ошибка при получении области экрана: {e}")
+
+            # Таймаут, ошибка команды или отсутствие tail/head на устройстве:
+            # неработающая обрезка не должна повторяться на каждом кадре
+            self._region_screencap_failures += 1
+            if self._region_screencap_failures >= self.RAW_SCREENCAP_MAX_FAILURES:
+                self.logger.warning("Обрезка скриншота на устройстве не работает, используется полный снимок")
+                self.region_screencap_supported = False
+            return None
+
     def screenshot(self):
         """
         Получение скриншота экрана.
@@ -188,10 +483,24 @@ class ADBController:
         Returns:
             numpy.ndarray: изображение в формате OpenCV (BGR)
         """
-        try:
-            # Использование shell команды screencap для получения скриншота в бинарном формате
-            self.logger.debug("Получение скриншота экрана")
+        # Использование shell команды screencap для получения скриншота в бинарном формате
+        self.logger.debug("Получение скриншота экрана")
+
+        # Метод 0: Сырой screencap через exec-out (без PNG-кодирования на устройстве и декодирования здесь)
+        image = self.screenshot_raw()
+        if image is not None:
+            return image
+
+        return self.screenshot_png()
 
+    def screenshot_png(self):
+        """
+        Получение скриншота в формате PNG (без попытки сырого screencap).
+
+        Returns:
+            numpy.ndarray: изображение в формате OpenCV (BGR)
+        """
+        try:
             # Метод 1: Через exec-out (более быстрый метод, но может не работать на некоторых устройствах)
             try:
                 # Используем binary_output=True, т.к. screencap возвращает бинарные данные
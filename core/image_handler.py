@@ -11,6 +11,13 @@ from config import TEMPLATE_MATCHING_THRESHOLD, SCREENSHOT_TIMEOUT
 class ImageHandler:
     """Класс для обработки изображений и поиска шаблонов на экране."""
 
+    # Поиск по пирамиде: грубый поиск на уменьшенном скриншоте, уточнение
+    # в полном разрешении только вокруг лучших кандидатов
+    PYRAMID_LEVELS = 2  # Сколько раз скриншот уменьшается вдвое
+    PYRAMID_MIN_TEMPLATE_SIZE = 12  # Минимальная сторона шаблона на грубом уровне
+    PYRAMID_CANDIDATES = 3  # Сколько кандидатов грубого уровня проверяется точно
+    PYRAMID_FALLBACK_MARGIN = 0.15  # Насколько ниже порога грубое совпадение еще проверяется целиком
+
     def __init__(self, adb_controller):
         """
         Инициализация обработчика изображений.
@@ -21,6 +28,8 @@ class ImageHandler:
         self.logger = logging.getLogger('sea_conquest_bot.image')
         self.adb = adb_controller
         self.templates = {}  # Кэш шаблонов изображений
+        self.template_pyramids = {}  # Кэш пирамид шаблонов (полное разрешение первым)
+        self.last_screenshot = None  # Последний скриншот, полученный при ожидании шаблона
 
     def load_template(self, template_path):
         """
@@ -46,6 +55,28 @@ class ImageHandler:
         self.templates[template_path] = template
         return template
 
+    def load_template_pyramid(self, template_path):
+        """
+        Загрузка пирамиды шаблона: шаблон и его уменьшенные вдвое копии.
+
+        Args:
+            template_path: путь к файлу шаблона
+
+        Returns:
+            list: уровни пирамиды, начиная с полного разрешения
+        """
+        if template_path in self.template_pyramids:
+            return self.template_pyramids[template_path]
+
+        # Маленькие шаблоны уменьшаются меньше раз (или не уменьшаются вовсе)
+        pyramid = [self.load_template(template_path)]
+        while len(pyramid) <= self.PYRAMID_LEVELS and \
+                min(pyramid[-1].shape[:2]) // 2 >= self.PYRAMID_MIN_TEMPLATE_SIZE:
+            pyramid.append(cv2.pyrDown(pyramid[-1]))
+
+        self.template_pyramids[template_path] = pyramid
+        return pyramid
+
     def find_template(self, screenshot, template_path, threshold=TEMPLATE_MATCHING_THRESHOLD):
         """
         Поиск шаблона на скриншоте.
@@ -59,7 +90,20 @@ class ImageHandler:
             tuple: (x, y, w, h) координаты и размеры найденного шаблона или None
         """
         # Загрузка шаблона
-        template = self.load_template(template_path)
+        pyramid = self.load_template_pyramid(template_path)
+        if len(pyramid) > 1:
+            result, coarse_score = self._find_template_coarse_to_fine(screenshot, pyramid, threshold)
+            if result:
+                return result
+            # Кандидаты не подтвердились. Если грубое совпадение близко к порогу,
+            # малоконтрастный шаблон мог потеряться при уменьшении, и скриншот
+            # проверяется целиком в полном разрешении; иначе шаблона на экране нет
+            if coarse_score < threshold - self.PYRAMID_FALLBACK_MARGIN:
+                return None
+
+        template = pyramid[0]
+        if template.shape[0] > screenshot.shape[0] or template.shape[1] > screenshot.shape[1]:
+            return None
 
         # Поиск шаблона
         result = cv2.matchTemplate(screenshot, template, cv2.TM_CCOEFF_NORMED)
@@ -77,6 +121,61 @@ class ImageHandler:
 
         return None
 
+    def _find_template_coarse_to_fine(self, screenshot, pyramid, threshold):
+        """
+        Поиск шаблона по пирамиде: грубый поиск на уменьшенном скриншоте
+        и проверка лучших кандидатов в полном разрешении.
+
+        Args:
+            screenshot: скриншот (numpy.ndarray)
+            pyramid: пирамида шаблона (результат load_template_pyramid)
+            threshold: порог соответствия (0-1)
+
+        Returns:
+            tuple: ((x, y, w, h) найденного шаблона или None,
+                    лучшее совпадение на грубом уровне)
+        """
+        levels = len(pyramid) - 1
+        scale = 2 ** levels
+
+        coarse = screenshot
+        for _ in range(levels):
+            coarse = cv2.pyrDown(coarse)
+
+        coarse_template = pyramid[-1]
+        if coarse_template.shape[0] > coarse.shape[0] or coarse_template.shape[1] > coarse.shape[1]:
+            return None, -1.0
+
+        result = cv2.matchTemplate(coarse, coarse_template, cv2.TM_CCOEFF_NORMED)
+        coarse_score = float(result.max())
+
+        template = pyramid[0]
+        h, w = template.shape[:2]
+        c_h, c_w = coarse_template.shape[:2]
+        margin = scale * 2  # Погрешность положения после уменьшения
+
+        for _ in range(self.PYRAMID_CANDIDATES):
+            _, _, _, (c_x, c_y) = cv2.minMaxLoc(result)
+
+            # Уточнение в полном разрешении в небольшой окрестности кандидата
+            x0 = max(0, c_x * scale - margin)
+            y0 = max(0, c_y * scale - margin)
+            x1 = min(screenshot.shape[1], c_x * scale + w + margin)
+            y1 = min(screenshot.shape[0], c_y * scale + h + margin)
+            roi = screenshot[y0:y1, x0:x1]
+
+            if roi.shape[0] >= h and roi.shape[1] >= w:
+                fine = cv2.matchTemplate(roi, template, cv2.TM_CCOEFF_NORMED)
+                _, max_val, _, max_loc = cv2.minMaxLoc(fine)
+                if max_val >= threshold:
+                    return (x0 + max_loc[0] + w // 2, y0 + max_loc[1] + h // 2, w, h), coarse_score
+
+            # Исключаем окрестность проверенного кандидата
+            result[max(0, c_y - c_h // 2):c_y + c_h // 2 + 1,
+                   max(0, c_x - c_w // 2):c_x + c_w // 2 + 1] = -1
+
+        return None, coarse_score
+
     def wait_for_template(self, template_path, timeout=30, threshold=TEMPLATE_MATCHING_THRESHOLD):
         """
         Ожидание появления шаблона на экране.
@@ -96,6 +195,7 @@ class ImageHandler:
             try:
                 # Получение скриншота
                 screenshot = self.adb.screenshot()
+                self.last_screenshot = screenshot
 
                 if screenshot is None or screenshot.size == 0:
                     self.logger.warning("Получен пустой скриншот")
@@ -125,11 +125,13 @@ class StepHandler(logging.Handler):
         self.last_step = None
 
     def emit(self, record):
-        # Проверяем, содержит ли запись номер шага
+        # Проверяем, содержит ли запись номер шага (сообщение может быть
+        # в %-формате с отложенной подстановкой аргументов)
         try:
-            if "Выполняем шаг" in record.msg:
+            message = record.getMessage()
+            if "Выполняем шаг" in message:
                 # Извлекаем номер шага с помощью строкового поиска
-                parts = record.msg.split("Выполняем шаг ")
+                parts = message.split("Выполняем шаг ")
                 if len(parts) > 1:
                     step_part = parts[1].split(":", 1)[0].strip()
                     try:
@@ -309,7 +311,7 @@ def log_failure(logger, message):
 
 def log_step(logger, step_number, message):
     """Логирование начала шага с разделителем."""
-    logger.info(f"Выполняем шаг {step_number}: {message}")
+    logger.info("Выполняем шаг %s: %s", step_number, message)
 
 
 def log_section(logger, title):
@@ -54,6 +54,12 @@ class OptimizedGameBot:
 
         self.logger.info("✅ Все компоненты бота инициализированы успешно")
 
+    def close(self) -> None:
+        """Освобождение ресурсов компонентов (фоновые потоки, сессия adb shell, Tesseract)."""
+        self.tutorial_executor.close()
+        self.ocr.close()
+        self.adb.close()
+
     # Основные методы управления игрой
 
     def start_game(self) -> None:
@@ -348,6 +348,7 @@ def main():
         logger.error("Проверка окружения не пройдена. Выход.")
         sys.exit(1)
 
+    game_bot = None
     try:
         # Инициализация компонентов
         logger.info(safe_log_message("🔧 Инициализация компонентов...",
@@ -421,6 +422,8 @@ def main():
         print(f"\nКритическая ошибка: {e}")
         sys.exit(1)
     finally:
+        if game_bot is not None:
+            game_bot.close()
         logger.info(safe_log_message("🏁 Работа бота завершена", "Работа бота завершена"))
         print(safe_log_message("👋 До свидания!", "До свидания!"))
 
@@ -3,8 +3,8 @@
 """
 
 
-from .tutorial_executor import TutorialExecutor
+from .tutorial_executor import TutorialExecutor, TutorialCancelled
 from .tutorial_steps import TutorialSteps, TutorialStep
 from .skip_button_finder import UltraFastSkipButtonFinder
 
-__all__ = ['TutorialExecutor', 'TutorialSteps', 'TutorialStep', 'UltraFastSkipButtonFinder']
\ No newline at end of file
+__all__ = ['TutorialExecutor', 'TutorialCancelled', 'TutorialSteps', 'TutorialStep', 'UltraFastSkipButtonFinder']
\ No newline at end of file
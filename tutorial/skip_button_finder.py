@@ -4,16 +4,59 @@
 """
 import cv2
 import numpy as np
+import atexit
+import bisect
 import logging
+import re
 import time
 import os
+import queue
+import threading
 from typing import Optional, Tuple, List
 from pathlib import Path
 
+from config import OCR_SETTINGS, SKIP_TEMPLATES_DIR, TEMPLATE_MATCHING_THRESHOLD
+
 
 class UltraFastSkipButtonFinder:
     """Супер-быстрый поисковик кнопки ПРОПУСТИТЬ с мгновенным распознаванием."""
 
+    # Границы белого цвета в HSV (uint8, чтобы inRange не конвертировал их на каждом вызове)
+    WHITE_HSV_LOWER = np.array([0, 0, 180], dtype=np.uint8)
+    WHITE_HSV_UPPER = np.array([255, 30, 255], dtype=np.uint8)
+
+    # Пауза между попытками: растет, пока область поиска не меняется, и сбрасывается при изменении
+    MIN_ATTEMPT_PAUSE = 0.05
+    MAX_ATTEMPT_PAUSE = 0.5
+
+    # Увеличение области перед бинаризацией: буквы кнопки (~20 px) вырастают до высоты,
+    # на которой LSTM Tesseract распознает их увереннее
+    OCR_SCALE = 2
+
+    # Отступ между вариантами бинаризации в склеенном изображении
+    TILE_GAP = 10
+
+    # Предварительный фильтр: OCR запускается, только если число ярких пикселей в области
+    # похоже на текст кнопки. Раз в N попыток фильтр пропускается, чтобы при неудачных
+    # границах кнопка все равно нашлась, а границы подстроились под нее
+    BRIGHT_PIXEL_LEVEL = 200
+    BRIGHT_PIXEL_RANGE = (200, 4000)
+    PREFILTER_BYPASS_EVERY = 10
+
+    # Очистка распознанного текста от всего, кроме букв, цифр и стрелок
+    CLEAN_TEXT_RE = re.compile(r'[^\w>»]')
+
+    # Частичные совпадения в длинном тексте: все слова ищутся одним проходом
+    SKIP_WORD_RE = re.compile(r'ПРОПУСТИТЬ|SKIP')
+
+    # Поиск по цвету почти всегда дублирует инвертированную бинаризацию,
+    # поэтому как последний шанс он запускается только на каждой N-й попытке
+    COLOR_DETECTION_EVERY = 5
+
+    # Порог Оцу для области пересчитывается раз в N попыток: яркость сцены
+    # меняется медленно, а гистограмма считается по каждому кадру
+    OTSU_REFRESH_EVERY = 5
+
     def __init__(self, adb_controller, interface_controller, debug_mode=False):
         """
         Инициализация супер-быстрого поисковика кнопки ПРОПУСТИТЬ.
@@ -27,17 +70,30 @@ class UltraFastSkipButtonFinder:
         self.adb = adb_controller
         self.interface = interface_controller
         self.debug_mode = debug_mode
-        self.ocr_available = self._check_ocr_availability()
+        self.ocr_language = OCR_SETTINGS.get('skip_button_language', 'rus')
 
-        # Создаем папку для отладки если нужно
+        # Папка для отладки (создается если нужно); префикс пути готовится один раз,
+        # имена файлов просто приклеиваются к нему
+        self.debug_dir = Path("debug_skip_screenshots")
+        self._debug_prefix = str(self.debug_dir) + os.sep
         if self.debug_mode:
-            self.debug_dir = Path("debug_skip_screenshots")
             self.debug_dir.mkdir(exist_ok=True)
 
         # Точная область поиска кнопки (на основе скриншотов)
         # Кнопка находится в правом верхнем углу
         self.primary_region = (1020, 15, 240, 70)  # Основная область
         self.fallback_region = (980, 10, 280, 80)  # Резервная область
+        self.regions = {
+            "primary": self.primary_region,
+            "fallback": self.fallback_region
+        }
+
+        # Общий прямоугольник обеих областей - с устройства забирается только он
+        left = min(r[0] for r in self.regions.values())
+        top = min(r[1] for r in self.regions.values())
+        right = max(r[0] + r[2] for r in self.regions.values())
+        bottom = max(r[1] + r[3] for r in self.regions.values())
+        self.search_area = (left, top, right - left, bottom - top)
 
         # Варианты текста (упорядочены по вероятности)
         self.skip_variants = [
@@ -48,75 +104,327 @@ class UltraFastSkipButtonFinder:
             "SKIP",
             "Skip"
         ]
+        # Очищенные варианты для проверки за одно обращение к множеству
+        self._clean_variants = frozenset(
+            self.CLEAN_TEXT_RE.sub('', variant.upper()) for variant in self.skip_variants
+        )
+
+        # OCR ищет только символы из вариантов текста кнопки: у декодера намного
+        # меньше классов, и посторонние надписи не превращаются в похожие слова
+        self.char_whitelist = ''.join(sorted(set(''.join(self.skip_variants)) - {' '} | {'»'}))
+
+        # Постоянный экземпляр Tesseract: модели загружаются один раз, а не на каждый вызов
+        self._tess = self._create_tess_api()
+
+        # Запасной путь через pytesseract: модуль и строка параметров готовятся один раз
+        self._pytesseract = None
+        self._pytesseract_config = f'--psm 11 --oem 3 -c tessedit_char_whitelist={self.char_whitelist}'
+        self.ocr_available = self._check_ocr_availability()
+
+        # Бинаризованные шаблоны надписи: сопоставление с ними на порядки быстрее OCR,
+        # Tesseract остается запасным путем (и источником шаблонов в режиме отладки)
+        self._templates = self._load_templates()
 
         # Счетчик попыток
         self.attempt_counter = 0
         self.total_search_time = 0
         self.successful_searches = 0
 
+        # Допустимое число ярких пикселей (расширяется по успешным находкам)
+        self._bright_range = self.BRIGHT_PIXEL_RANGE
+
+        # Неизменные кадры (тот же хеш области поиска) не распознаются повторно
+        self._last_area_hash = None
+        self._unchanged_frames = 0
+        # Прошел ли текущий неизменный кадр проверки без фильтра яркости и по цвету
+        self._area_prefilter_bypassed = False
+        self._area_color_checked = False
+
+        # Кеш порогов Оцу: имя области -> (порог, номер попытки расчета)
+        self._otsu_levels = {}
+
+        # Фоновый захват скриншотов: в очереди всегда лежит только самый свежий кадр
+        self._capture_pause = 0.0
+        self._frames = queue.Queue(maxsize=1)
+        self._capture_stop = threading.Event()
+        self._capture_thread = None
+
+        # Отладочные изображения пишутся на диск фоновым потоком (запускается при первой записи)
+        self._debug_queue = queue.Queue()
+        self._debug_thread = None
+        self._debug_exit_hook = False
+
     def _check_ocr_availability(self) -> bool:
         """Проверка доступности OCR."""
+        if self._tess is not None:
+            return True
+
         try:
             import pytesseract
+            self._pytesseract = pytesseract
             return True
         except ImportError:
             self.logger.error("OCR не доступен - pytesseract не установлен")
             return False
 
-    def find_skip_button_infinite(self) -> bool:
+    def _create_tess_api(self):
         """
-        Супер-быстрый бесконечный поиск кнопки ПРОПУСТИТЬ.
-        Оптимизирован для мгновенного распознавания.
+        Создание постоянного экземпляра Tesseract через tesserocr.
 
         Returns:
-            bool: True когда кнопка найдена и нажата
+            PyTessBaseAPI или None, если tesserocr не установлен
+        """
+        try:
+            from tesserocr import PyTessBaseAPI, PSM, OEM, RIL
+        except ImportError:
+            self.logger.debug("tesserocr не установлен, распознавание через pytesseract")
+            return None
+
+        try:
+            api = PyTessBaseAPI(lang=self.ocr_language, psm=PSM.SPARSE_TEXT, oem=OEM.DEFAULT)
+            api.SetVariable('tessedit_char_whitelist', self.char_whitelist)
+            # Уровень строк для обхода результатов: по координатам строки определяется область
+            self._tess_textline = RIL.TEXTLINE
+            return api
+        except Exception as e:
+            self.logger.warning(f"Не удалось инициализировать tesserocr, используется pytesseract: {e}")
+            return None
+
+    def _recognize_lines(self, image: np.ndarray) -> List[Tuple[str, Tuple[int, int, int, int]]]:
+        """
+        Распознавание строк текста на склеенном изображении вариантов бинаризации.
+
+        Args:
+            image: одноканальное изображение
+
+        Returns:
+            list: (текст строки, (left, top, right, bottom)) для каждой распознанной строки
+        """
+        if self._tess is not None:
+            height, width = image.shape[:2]
+            self._tess.SetImageBytes(image.tobytes(), width, height, 1, width)
+            self._tess.Recognize()
+
+            lines = []
+            iterator = self._tess.GetIterator()
+            while iterator is not None:
+                text = iterator.GetUTF8Text(self._tess_textline)
+                box = iterator.BoundingBox(self._tess_textline)
+                if text and text.strip() and box:
+                    lines.append((text.strip(), box))
+                if not iterator.Next(self._tess_textline):
+                    break
+            return lines
+
+        # PSM 11 - разреженный текст: по строке на каждый вариант бинаризации
+        data = self._pytesseract.image_to_data(
+            image, lang=self.ocr_language, config=self._pytesseract_config,
+            output_type=self._pytesseract.Output.DICT
+        )
+
+        # Слова собираются в строки по номерам блока, абзаца и строки
+        lines = {}
+        for i, word in enumerate(data['text']):
+            if not word.strip():
+                continue
+            key = (data['block_num'][i], data['par_num'][i], data['line_num'][i])
+            left, top = data['left'][i], data['top'][i]
+            right, bottom = left + data['width'][i], top + data['height'][i]
+            if key in lines:
+                text, (l, t, r, b) = lines[key]
+                lines[key] = (f"{text} {word}", (min(l, left), min(t, top), max(r, right), max(b, bottom)))
+            else:
+                lines[key] = (word, (left, top, right, bottom))
+
+        return list(lines.values())
+
+    def _load_templates(self) -> List[np.ndarray]:
+        """
+        Загрузка шаблонов надписи кнопки ПРОПУСТИТЬ.
+
+        Returns:
+            List: бинаризованные шаблоны (оттенки серого)
+        """
+        templates = []
+        for path in sorted(SKIP_TEMPLATES_DIR.glob("skip_*.png")):
+            template = cv2.imread(str(path), cv2.IMREAD_GRAYSCALE)
+            if template is not None:
+                templates.append(template)
+
+        if templates:
+            self.logger.info(f"Загружено шаблонов кнопки ПРОПУСТИТЬ: {len(templates)}")
+        return templates
+
+    def _template_match(self, binary: np.ndarray) -> Optional[Tuple[int, int]]:
+        """
+        Поиск надписи по шаблонам на инвертированной бинаризации области.
+
+        Args:
+            binary: результат _method_inverted_threshold для области
+
+        Returns:
+            tuple: (x, y) центр лучшего совпадения в координатах области или None
+        """
+        # Окно шаблона, не задевающее ни одного пикселя надписи, однотонное и дает
+        # нулевую корреляцию. Поэтому рамка надписи ищется один раз на кадр,
+        # и все шаблоны сопоставляются только в ее окрестности
+        x, y, w, h = cv2.boundingRect(cv2.bitwise_not(binary))
+        if w == 0 or h == 0:
+            return None
+
+        max_h = max(template.shape[0] for template in self._templates)
+        max_w = max(template.shape[1] for template in self._templates)
+        x0, y0 = max(0, x - max_w + 1), max(0, y - max_h + 1)
+        x1 = min(binary.shape[1], x + w + max_w - 1)
+        y1 = min(binary.shape[0], y + h + max_h - 1)
+        search = binary[y0:y1, x0:x1]
+
+        best_score = TEMPLATE_MATCHING_THRESHOLD
+        best_coords = None
+
+        for template in self._templates:
+            t_h, t_w = template.shape[:2]
+            if t_h > search.shape[0] or t_w > search.shape[1]:
+                continue
+
+            result = cv2.matchTemplate(search, template, cv2.TM_CCOEFF_NORMED)
+            _, max_val, _, max_loc = cv2.minMaxLoc(result)
+            if max_val >= best_score:
+                best_score = max_val
+                best_coords = (x0 + max_loc[0] + t_w // 2, y0 + max_loc[1] + t_h // 2)
+
+        return best_coords
+
+    def _capture_template(self, binary: np.ndarray):
+        """
+        Сохранение надписи, найденной через OCR, как шаблона (только в режиме отладки).
+
+        Args:
+            binary: результат _method_inverted_threshold для области с кнопкой
+        """
+        if not self.debug_mode or self._templates:
+            return
+
+        try:
+            # Обрезаем по надписи (черный текст на белом фоне) с небольшим полем
+            x, y, w, h = cv2.boundingRect(cv2.bitwise_not(binary))
+            if w == 0 or h == 0:
+                return
+
+            pad = 2
+            x0, y0 = max(0, x - pad), max(0, y - pad)
+            template = binary[y0:y + h + pad, x0:x + w + pad].copy()
+
+            SKIP_TEMPLATES_DIR.mkdir(parents=True, exist_ok=True)
+            filepath = SKIP_TEMPLATES_DIR / "skip_0.png"
+            cv2.imwrite(str(filepath), template)
+            self._templates.append(template)
+            self.logger.info(f"💾 Сохранен шаблон кнопки ПРОПУСТИТЬ: {filepath}")
+        except Exception as e:
+            self.logger.debug(f"Ошибка сохранения шаблона: {e}")
+
+    def close(self):
+        """Освобождение ресурсов (фоновый захват, экземпляр Tesseract)."""
+        self._stop_capture()
+        self._stop_debug_writer()
+        if self._tess is not None:
+            self._tess.End()
+            self._tess = None
+
+    def find_skip_button(self, timeout: Optional[float] = None) -> bool:
+        """
+        Супер-быстрый поиск кнопки ПРОПУСТИТЬ.
+
+        Сначала проверяется один скриншот без запуска фонового захвата (кнопка часто
+        уже на экране), затем захват и распознавание идут параллельно.
+
+        Args:
+            timeout: максимальное время поиска в секундах (None - без ограничения)
+
+        Returns:
+            bool: True если кнопка найдена и нажата
         """
         if not self.ocr_available:
             self.logger.error("OCR не доступен, невозможно найти кнопку ПРОПУСТИТЬ")
             return False
 
-        self.logger.info("🚀 Запуск супер-быстрого поиска кнопки ПРОПУСТИТЬ")
+        if timeout is None:
+            self.logger.info("🚀 Запуск супер-быстрого поиска кнопки ПРОПУСТИТЬ")
+        else:
+            self.logger.info(f"⚡ Супер-быстрый поиск ПРОПУСТИТЬ с таймаутом {timeout}с")
 
         self.attempt_counter = 0
+        self._reset_frame_tracking()
         start_time = time.time()
         last_log_time = start_time
 
-        while True:
-            self.attempt_counter += 1
-            attempt_start = time.time()
-
-            try:
-                # Супер-быстрый поиск
-                coords = self._ultra_fast_search()
+        # Быстрый путь: одна попытка на только что снятом кадре
+        self.attempt_counter += 1
+        try:
+            coords = self._ultra_fast_search()
+            if coords:
+                self._on_found(coords, start_time)
+                return True
+        except Exception as e:
+            self.logger.debug(f"Ошибка в попытке {self.attempt_counter}: {e}")
 
-                if coords:
-                    elapsed = time.time() - start_time
-                    self.total_search_time += elapsed
-                    self.successful_searches += 1
-                    avg_time = self.total_search_time / self.successful_searches
-
-                    self.logger.info(
-                        f"⚡ ПРОПУСТИТЬ найден за {elapsed:.2f}с на попытке {self.attempt_counter} "
-                        f"(среднее время: {avg_time:.2f}с)"
-                    )
-                    self.interface.click_coord(coords[0], coords[1])
-                    return True
+        # Следующий скриншот снимается, пока распознается текущий;
+        # Tesseract вызывается только из этого потока
+        self._start_capture()
+        try:
+            while True:
+                wait = 1.0
+                if timeout is not None:
+                    remaining = timeout - (time.time() - start_time)
+                    if remaining <= 0:
+                        break
+                    wait = min(wait, remaining)
+
+                try:
+                    area = self._frames.get(timeout=wait)
+                except queue.Empty:
+                    continue
+
+                self.attempt_counter += 1
+
+                try:
+                    # Супер-быстрый поиск
+                    coords = self._ultra_fast_search(area)
+
+                    if coords:
+                        self._capture_stop.set()
+                        self._on_found(coords, start_time)
+                        return True
+
+                except Exception as e:
+                    self.logger.debug(f"Ошибка в попытке {self.attempt_counter}: {e}")
+
+                # Пока экран не меняется, фоновый захват замедляется
+                self._capture_pause = self._attempt_pause() if self._unchanged_frames else 0.0
+
+                # Логируем прогресс каждые 5 секунд
+                current_time = time.time()
+                if current_time - last_log_time >= 5:
+                    self.logger.info(f"🔍 Поиск продолжается... Попытка {self.attempt_counter} (время: {current_time - start_time:.1f}с)")
+                    last_log_time = current_time
+        finally:
+            self._stop_capture()
 
-            except Exception as e:
-                self.logger.debug(f"Ошибка в попытке {self.attempt_counter}: {e}")
+        self.logger.warning(f"ПРОПУСТИТЬ не найден за {timeout}с ({self.attempt_counter} попыток)")
+        return False
 
-            # Логируем прогресс каждые 5 секунд
-            current_time = time.time()
-            if current_time - last_log_time >= 5:
-                self.logger.info(f"🔍 Поиск продолжается... Попытка {self.attempt_counter} (время: {current_time - start_time:.1f}с)")
-                last_log_time = current_time
+    def find_skip_button_infinite(self) -> bool:
+        """
+        Бесконечный поиск кнопки ПРОПУСТИТЬ (см. find_skip_button).
 
-            # Минимальная пауза между попытками
-            time.sleep(0.05)  # Еще меньше паузы для максимальной скорости
+        Returns:
+            bool: True когда кнопка найдена и нажата
+        """
+        return self.find_skip_button()
 
     def find_skip_button_with_timeout(self, timeout: int = 10) -> bool:
         """
-        Супер-быстрый поиск кнопки ПРОПУСТИТЬ с таймаутом.
+        Поиск кнопки ПРОПУСТИТЬ с таймаутом (см. find_skip_button).
 
         Args:
             timeout: максимальное время поиска в секундах
@@ -124,219 +432,461 @@ class UltraFastSkipButtonFinder:
         Returns:
             bool: True если кнопка найдена и нажата
         """
-        if not self.ocr_available:
-            return False
+        return self.find_skip_button(timeout)
 
-        self.logger.info(f"⚡ Супер-быстрый поиск ПРОПУСТИТЬ с таймаутом {timeout}с")
+    def _on_found(self, coords: Tuple[int, int], start_time: float):
+        """
+        Учет статистики и клик по найденной кнопке.
 
-        start_time = time.time()
-        self.attempt_counter = 0
+        Args:
+            coords: (x, y) экранные координаты кнопки
+            start_time: время начала поиска
+        """
+        elapsed = time.time() - start_time
+        self.total_search_time += elapsed
+        self.successful_searches += 1
+        avg_time = self.total_search_time / self.successful_searches
+
+        self.logger.info(
+            f"⚡ ПРОПУСТИТЬ найден за {elapsed:.2f}с на попытке {self.attempt_counter} "
+            f"(среднее время: {avg_time:.2f}с)"
+        )
+        self.interface.click_coord(coords[0], coords[1])
+
+    def _reset_frame_tracking(self):
+        """Сброс отслеживания неизменных кадров перед новым поиском."""
+        self._last_area_hash = None
+        self._unchanged_frames = 0
+        self._area_prefilter_bypassed = False
+        self._area_color_checked = False
+        self._capture_pause = 0.0
+        self._otsu_levels.clear()
+
+    def _attempt_pause(self) -> float:
+        """
+        Пауза перед следующей попыткой с экспоненциальным ростом на неизменном экране.
 
-        while time.time() - start_time < timeout:
-            self.attempt_counter += 1
+        Returns:
+            float: пауза в секундах
+        """
+        return min(self.MAX_ATTEMPT_PAUSE, self.MIN_ATTEMPT_PAUSE * (1.5 ** self._unchanged_frames))
 
-            try:
-                coords = self._ultra_fast_search()
+    def _start_capture(self):
+        """
+        Запуск фонового потока захвата скриншотов.
 
-                if coords:
-                    elapsed = time.time() - start_time
-                    self.logger.info(f"⚡ ПРОПУСТИТЬ найден за {elapsed:.2f}с на попытке {self.attempt_counter}")
-                    self.interface.click_coord(coords[0], coords[1])
-                    return True
+        У каждого запуска свои событие остановки и очередь кадров: поток прошлого
+        поиска, не успевший завершиться (например, завис в скриншоте ADB), остается
+        остановленным и не подкладывает устаревшие кадры в новый поиск.
+        """
+        self._stop_capture()
+        self._capture_stop = threading.Event()
+        self._frames = queue.Queue(maxsize=1)
+        self._capture_thread = threading.Thread(
+            target=self._capture_loop, args=(self._capture_stop, self._frames),
+            name="skip_capture", daemon=True
+        )
+        self._capture_thread.start()
+
+    def _stop_capture(self):
+        """Остановка фонового потока захвата и очистка очереди кадров."""
+        self._capture_stop.set()
+        if self._capture_thread is not None:
+            self._capture_thread.join(timeout=2.0)
+            if self._capture_thread.is_alive():
+                self.logger.debug("Поток захвата не завершился вовремя, он остановится после текущего скриншота")
+            self._capture_thread = None
+
+        try:
+            self._frames.get_nowait()
+        except queue.Empty:
+            pass
+
+    def _capture_loop(self, stop: threading.Event, frames: queue.Queue):
+        """
+        Цикл фонового потока: снимает скриншоты и оставляет в очереди только последний.
 
+        Args:
+            stop: событие остановки этого запуска
+            frames: очередь кадров этого запуска
+        """
+        while not stop.is_set():
+            try:
+                area = self._grab_search_area()
             except Exception as e:
-                self.logger.debug(f"Ошибка в попытке {self.attempt_counter}: {e}")
+                self.logger.debug(f"Ошибка захвата скриншота: {e}")
+                time.sleep(0.05)
+                continue
 
-            time.sleep(0.05)
+            if area is None or area.size == 0:
+                time.sleep(0.05)
+                continue
 
-        self.logger.warning(f"ПРОПУСТИТЬ не найден за {timeout}с ({self.attempt_counter} попыток)")
-        return False
+            # Кадр, снятый после остановки, уже никому не нужен
+            if stop.is_set():
+                break
+
+            # Устаревший кадр выбрасываем, чтобы распознавание всегда шло по свежему
+            try:
+                frames.get_nowait()
+            except queue.Empty:
+                pass
+            frames.put(area)
 
-    def _ultra_fast_search(self) -> Optional[Tuple[int, int]]:
+            if self._capture_pause:
+                stop.wait(self._capture_pause)
+
+    def _grab_search_area(self) -> Optional[np.ndarray]:
+        """
+        Снимок области поиска кнопки по самому быстрому доступному пути.
+
+        Returns:
+            numpy.ndarray: область поиска (BGR) или None
+        """
+        ax, ay, aw, ah = self.search_area
+
+        # Обрезка на устройстве: по ADB передается только полоса с кнопкой
+        area = self.adb.screenshot_region(ax, ay, aw, ah)
+        if area is not None:
+            return area
+
+        # Сырой screencap без PNG-кодирования и декодирования, PNG - запасной путь
+        screenshot = self.adb.screenshot_raw()
+        if screenshot is None:
+            screenshot = self.adb.screenshot_png()
+        if screenshot is None:
+            return None
+
+        return screenshot[ay:ay + ah, ax:ax + aw]
+
+    def _ultra_fast_search(self, area: Optional[np.ndarray] = None) -> Optional[Tuple[int, int]]:
         """
         Супер-быстрый поиск кнопки ПРОПУСТИТЬ с минимальной обработкой.
 
+        Args:
+            area: готовый снимок области поиска (если не передан, снимается новый)
+
         Returns:
-            tuple: (x, y) координаты центра кнопки или None
+            tuple: (x, y) экранные координаты центра кнопки или None
         """
-        # Получаем скриншот
-        screenshot = self.adb.screenshot()
-        if screenshot is None or screenshot.size == 0:
+        # Получаем снимок области поиска
+        if area is None:
+            area = self._grab_search_area()
+        if area is None or area.size == 0:
             return None
 
+        # Попытки с обходом фильтра яркости и с поиском по цвету проверяют больше,
+        # чем обычные, поэтому неизменный кадр пропускается, только если он уже
+        # прошел такие проверки
+        bypass_prefilter = self.attempt_counter % self.PREFILTER_BYPASS_EVERY == 0
+        color_detection = self.attempt_counter % self.COLOR_DETECTION_EVERY == 0
+
+        # Область не изменилась с прошлой попытки - результат распознавания будет тем же
+        area_hash = hash(area.tobytes())
+        if area_hash == self._last_area_hash:
+            self._unchanged_frames += 1
+            if (not bypass_prefilter or self._area_prefilter_bypassed) and \
+                    (not color_detection or self._area_color_checked):
+                return None
+        else:
+            self._last_area_hash = area_hash
+            self._unchanged_frames = 0
+            self._area_prefilter_bypassed = False
+            self._area_color_checked = False
+        self._area_prefilter_bypassed |= bypass_prefilter
+        self._area_color_checked |= color_detection
+
         # Сохраняем для отладки
         if self.debug_mode and self.attempt_counter % 20 == 1:
-            self._save_debug_image(screenshot, f"original_{self.attempt_counter}.png")
+            self._save_debug_image(area, f"area_{self.attempt_counter}.png")
+
+        # Каждая область готовит свои варианты бинаризации, шаблоны проверяются сразу
+        candidates = []
+        for region_name, region in self.regions.items():
+            candidate = self._prepare_region(area, region, region_name)
+            if candidate is None:
+                continue
+
+            # Сначала сопоставление с шаблонами надписи, OCR - запасной путь
+            if self._templates:
+                coords = self._template_match(candidate['tiles'][0])
+                if coords:
+                    self._tune_bright_range(candidate['bright_pixels'])
+                    return self._to_screen(candidate, coords)
 
-        # Сначала ищем в основной области
-        coords = self._search_in_region_ultra_fast(screenshot, self.primary_region, "primary")
-        if coords:
-            return coords
+            candidates.append(candidate)
 
-        # Если не найден, ищем в резервной области
-        coords = self._search_in_region_ultra_fast(screenshot, self.fallback_region, "fallback")
-        return coords
+        if not candidates:
+            return None
 
-    def _search_in_region_ultra_fast(self, screenshot: np.ndarray, region: Tuple[int, int, int, int],
-                                    region_name: str) -> Optional[Tuple[int, int]]:
+        return self._recognize_candidates(candidates)
+
+    def _prepare_region(self, area: np.ndarray, region: Tuple[int, int, int, int],
+                        region_name: str) -> Optional[dict]:
         """
-        Супер-быстрый поиск в конкретной области.
+        Подготовка области к распознаванию: вырезка, фильтр и варианты бинаризации.
 
         Args:
-            screenshot: скриншот экрана
-            region: область поиска (x, y, w, h)
+            area: снимок области поиска (self.search_area)
+            region: область поиска в экранных координатах (x, y, w, h)
             region_name: название области для отладки
 
         Returns:
-            tuple: (x, y) координаты или None
+            dict: name, offset (x, y в снимке области поиска), bright_pixels и tiles
+                  (первый - инвертированная бинаризация) или None, если область отсеяна
         """
+        ax, ay = self.search_area[:2]
         x, y, w, h = region
 
-        # Проверяем границы
-        x = max(0, x)
-        y = max(0, y)
-        w = min(screenshot.shape[1] - x, w)
-        h = min(screenshot.shape[0] - y, h)
+        # Переводим в координаты снимка области поиска и проверяем границы
+        x = max(0, x - ax)
+        y = max(0, y - ay)
+        w = min(area.shape[1] - x, w)
+        h = min(area.shape[0] - y, h)
 
         if w <= 0 or h <= 0:
             return None
 
-        # Вырезаем область
-        roi = screenshot[y:y + h, x:x + w]
+        # Вырезаем область в непрерывный буфер uint8: дальнейшие операции OpenCV
+        # работают по строкам без шага и используют быстрые векторные пути,
+        # все промежуточные маски остаются uint8
+        roi = np.ascontiguousarray(area[y:y + h, x:x + w], dtype=np.uint8)
 
         # Сохраняем ROI для отладки
         if self.debug_mode and self.attempt_counter % 20 == 1:
             self._save_debug_image(roi, f"roi_{region_name}_{self.attempt_counter}.png")
 
-        # Применяем только самые быстрые и эффективные методы
-        # Белый текст на темном фоне - идеальный случай для инвертированной бинаризации
-        coords = self._method_inverted_threshold(roi)
-        if coords:
-            return (x + coords[0], y + coords[1])
+        # Оттенки серого считаются один раз и используются всеми вариантами обработки
+        gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
+
+        # Дешевая проверка перед OCR: на кадрах без кнопки распознавание не запускаем
+        bright_pixels = self._count_bright_pixels(gray)
+        min_bright, max_bright = self._bright_range
+        if not min_bright < bright_pixels < max_bright \
+                and self.attempt_counter % self.PREFILTER_BYPASS_EVERY:
+            return None
 
-        # Если не найден, пробуем адаптивный порог
-        coords = self._method_adaptive_threshold(roi)
-        if coords:
-            return (x + coords[0], y + coords[1])
+        # Порог считается по исходной области: увеличение без интерполяции
+        # не меняет форму гистограммы, а пикселей в 4 раза меньше
+        level = self._otsu_level(gray, region_name)
 
-        # Последний шанс - поиск по цвету
-        coords = self._method_color_detection(roi)
-        if coords:
-            return (x + coords[0], y + coords[1])
+        # Увеличение без интерполяции: быстро и не размывает края букв
+        gray = cv2.resize(gray, None, fx=self.OCR_SCALE, fy=self.OCR_SCALE,
+                          interpolation=cv2.INTER_NEAREST)
 
-        return None
+        # Белый текст на темном фоне - идеальный случай для инвертированной бинаризации,
+        # затем адаптивный порог и последний шанс - поиск по цвету (не на каждой попытке)
+        tiles = [self._method_inverted_threshold(gray, level), self._method_adaptive_threshold(gray)]
+        if self.attempt_counter % self.COLOR_DETECTION_EVERY == 0:
+            tiles.append(self._method_color_detection(roi))
 
-    def _method_inverted_threshold(self, roi: np.ndarray) -> Optional[Tuple[int, int]]:
+        return {
+            'name': region_name,
+            'offset': (x, y),
+            'bright_pixels': bright_pixels,
+            'tiles': tiles,
+        }
+
+    def _recognize_candidates(self, candidates: List[dict]) -> Optional[Tuple[int, int]]:
         """
-        Метод инвертированной бинаризации - самый эффективный для белого текста на темном фоне.
+        Распознавание всех подготовленных областей одним вызовом OCR.
 
         Args:
-            roi: область интереса
+            candidates: результаты _prepare_region в порядке приоритета областей
 
         Returns:
-            tuple: (x, y) координаты или None
+            tuple: (x, y) экранные координаты центра надписи или None
         """
+        # Варианты всех областей складываются друг под другом, по вертикальной
+        # координате строки определяется вариант (и область), в котором она найдена
+        tiles = [tile for candidate in candidates for tile in candidate['tiles']]
+        owners = [number for number, candidate in enumerate(candidates) for _ in candidate['tiles']]
+        stacked, tile_tops = self._stack_tiles(tiles)
+        if self.debug_mode and self.attempt_counter % 20 == 1:
+            self._save_debug_image(stacked, f"stacked_{self.attempt_counter}.png")
+
         try:
-            import pytesseract
+            lines = self._recognize_lines(stacked)
+        except Exception as e:
+            self.logger.debug(f"Ошибка распознавания: {e}")
+            return None
+
+        best = None
+        for text, (left, top, right, bottom) in lines:
+            if not self._is_skip_text(text):
+                continue
 
-            # Конвертируем в оттенки серого
-            gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
+            index = bisect.bisect_right(tile_tops, top) - 1
+            # При совпадении в нескольких областях побеждает более приоритетная
+            if best is None or owners[index] < best[0]:
+                center = ((left + right) // 2, (top + bottom) // 2 - tile_tops[index])
+                best = (owners[index], center)
 
-            # Инвертированная бинаризация (белый текст становится черным на белом фоне)
-            _, binary = cv2.threshold(gray, 120, 255, cv2.THRESH_BINARY_INV)
+        if best is None:
+            return None
 
-            # Сохраняем для отладки
-            if self.debug_mode and self.attempt_counter % 20 == 1:
-                self._save_debug_image(binary, f"binary_inv_{self.attempt_counter}.png")
+        candidate = candidates[best[0]]
+        center = best[1]
+        self._tune_bright_range(candidate['bright_pixels'])
+        self._capture_template(candidate['tiles'][0])
+        return self._to_screen(candidate, center)
 
-            # Быстрая конфигурация OCR
-            config = '--psm 7 --oem 3'  # PSM 7 - одна строка текста
+    def _to_screen(self, candidate: dict, point: Tuple[int, int]) -> Tuple[int, int]:
+        """
+        Перевод точки из увеличенного варианта бинаризации в экранные координаты.
 
-            # Получаем текст
-            text = pytesseract.image_to_string(binary, lang='rus+eng', config=config).strip()
+        Args:
+            candidate: результат _prepare_region
+            point: (x, y) в координатах варианта бинаризации
 
-            # Проверяем совпадения
-            if self._is_skip_text(text):
-                # Возвращаем центр области
-                return (roi.shape[1] // 2, roi.shape[0] // 2)
+        Returns:
+            tuple: (x, y) экранные координаты
+        """
+        ax, ay = self.search_area[:2]
+        x, y = candidate['offset']
+        return (ax + x + point[0] // self.OCR_SCALE, ay + y + point[1] // self.OCR_SCALE)
 
-            return None
+    def _stack_tiles(self, tiles: List[np.ndarray]) -> Tuple[np.ndarray, List[int]]:
+        """
+        Склейка вариантов бинаризации в одно изображение для одного вызова OCR.
 
-        except Exception as e:
-            self.logger.debug(f"Ошибка в методе инвертированного порога: {e}")
-            return None
+        Args:
+            tiles: бинаризованные изображения
 
-    def _method_adaptive_threshold(self, roi: np.ndarray) -> Optional[Tuple[int, int]]:
+        Returns:
+            tuple: (изображения друг под другом с отступами, верхняя граница каждого варианта)
+        """
+        # Отступ заливается цветом фона варианта (в бинарном изображении фона больше,
+        # чем текста), а не продолжением краевых пикселей: иначе буквы на краю варианта
+        # протягиваются в отступ и сливаются со строкой следующего.
+        # Узкие варианты дополняются справа до общей ширины
+        width = max(tile.shape[1] for tile in tiles)
+        padded = []
+        for tile in tiles:
+            background = 255 if cv2.countNonZero(tile) * 2 >= tile.size else 0
+            padded.append(cv2.copyMakeBorder(tile, 0, self.TILE_GAP, 0, width - tile.shape[1],
+                                             cv2.BORDER_CONSTANT, value=background))
+
+        tile_tops = []
+        top = 0
+        for tile in padded:
+            tile_tops.append(top)
+            top += tile.shape[0]
+
+        return np.vstack(padded), tile_tops
+
+    def _count_bright_pixels(self, gray: np.ndarray) -> int:
         """
-        Метод адаптивной бинаризации.
+        Подсчет ярких пикселей в области (белый текст кнопки).
 
         Args:
-            roi: область интереса
+            gray: область интереса в оттенках серого
 
         Returns:
-            tuple: (x, y) координаты или None
+            int: количество пикселей ярче BRIGHT_PIXEL_LEVEL
         """
-        try:
-            import pytesseract
+        return cv2.countNonZero(cv2.compare(gray, self.BRIGHT_PIXEL_LEVEL, cv2.CMP_GT))
 
-            gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
+    def _tune_bright_range(self, bright_pixels: int):
+        """
+        Расширение границ предварительного фильтра по успешной находке.
 
-            # Адаптивная бинаризация
-            adaptive = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-                                           cv2.THRESH_BINARY_INV, 11, 2)
+        Args:
+            bright_pixels: число ярких пикселей в области, где найдена кнопка
+        """
+        min_bright, max_bright = self._bright_range
+        if min_bright < bright_pixels < max_bright:
+            return
 
-            # Сохраняем для отладки
-            if self.debug_mode and self.attempt_counter % 20 == 1:
-                self._save_debug_image(adaptive, f"adaptive_{self.attempt_counter}.png")
+        self._bright_range = (min(min_bright, bright_pixels // 2), max(max_bright, bright_pixels * 2))
+        self.logger.info(f"Границы фильтра ярких пикселей расширены до {self._bright_range}")
 
-            config = '--psm 7 --oem 3'
-            text = pytesseract.image_to_string(adaptive, lang='rus+eng', config=config).strip()
+    def _otsu_level(self, gray: np.ndarray, region_name: str) -> float:
+        """
+        Порог Оцу для области с кешированием на OTSU_REFRESH_EVERY попыток.
 
-            if self._is_skip_text(text):
-                return (roi.shape[1] // 2, roi.shape[0] // 2)
+        Args:
+            gray: область интереса в оттенках серого
+            region_name: имя области (ключ кеша)
 
-            return None
+        Returns:
+            float: порог бинаризации
+        """
+        cached = self._otsu_levels.get(region_name)
+        if cached and self.attempt_counter - cached[1] < self.OTSU_REFRESH_EVERY:
+            return cached[0]
 
-        except Exception as e:
-            self.logger.debug(f"Ошибка в методе адаптивного порога: {e}")
-            return None
+        level, _ = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+        self._otsu_levels[region_name] = (level, self.attempt_counter)
+        return level
 
-    def _method_color_detection(self, roi: np.ndarray) -> Optional[Tuple[int, int]]:
+    def _method_inverted_threshold(self, gray: np.ndarray, level: float) -> np.ndarray:
         """
-        Метод поиска по цвету - выделяем белые пиксели на темном фоне.
+        Инвертированная бинаризация - самый эффективный вариант для белого текста на темном фоне.
 
         Args:
-            roi: область интереса
+            gray: область интереса в оттенках серого
+            level: порог бинаризации (см. _otsu_level)
 
         Returns:
-            tuple: (x, y) координаты или None
+            numpy.ndarray: бинаризованное изображение
         """
-        try:
-            import pytesseract
+        # Инвертированная бинаризация (белый текст становится черным на белом фоне).
+        # Порог выбирается методом Оцу по гистограмме кадра вместо фиксированного значения
+        _, binary = cv2.threshold(gray, level, 255, cv2.THRESH_BINARY_INV)
 
-            # Конвертируем в HSV для лучшего выделения белого цвета
-            hsv = cv2.cvtColor(roi, cv2.COLOR_BGR2HSV)
+        # Сохраняем для отладки
+        if self.debug_mode and self.attempt_counter % 20 == 1:
+            self._save_debug_image(binary, f"binary_inv_{self.attempt_counter}.png")
 
-            # Маска для белого цвета
-            lower_white = np.array([0, 0, 180])
-            upper_white = np.array([255, 30, 255])
-            white_mask = cv2.inRange(hsv, lower_white, upper_white)
+        return binary
 
-            # Сохраняем для отладки
-            if self.debug_mode and self.attempt_counter % 20 == 1:
-                self._save_debug_image(white_mask, f"white_mask_{self.attempt_counter}.png")
+    def _method_adaptive_threshold(self, gray: np.ndarray) -> np.ndarray:
+        """
+        Адаптивная бинаризация.
 
-            config = '--psm 7 --oem 3'
-            text = pytesseract.image_to_string(white_mask, lang='rus+eng', config=config).strip()
+        Args:
+            gray: область интереса в оттенках серого
 
-            if self._is_skip_text(text):
-                return (roi.shape[1] // 2, roi.shape[0] // 2)
+        Returns:
+            numpy.ndarray: бинаризованное изображение
+        """
+        # Адаптивная бинаризация по среднему окна: OpenCV считает его box-фильтром,
+        # что заметно быстрее гауссова окна и не хуже для контрастной надписи
+        adaptive = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_MEAN_C,
+                                       cv2.THRESH_BINARY_INV, 11, 2)
 
-            return None
+        # Сохраняем для отладки
+        if self.debug_mode and self.attempt_counter % 20 == 1:
+            self._save_debug_image(adaptive, f"adaptive_{self.attempt_counter}.png")
 
-        except Exception as e:
-            self.logger.debug(f"Ошибка в методе поиска по цвету: {e}")
-            return None
+        return adaptive
+
+    def _method_color_detection(self, roi: np.ndarray) -> np.ndarray:
+        """
+        Поиск по цвету - выделяем белые пиксели на темном фоне.
+
+        Args:
+            roi: область интереса
+
+        Returns:
+            numpy.ndarray: маска белых пикселей
+        """
+        # Конвертируем в HSV для лучшего выделения белого цвета.
+        # Точный BGR-эквивалент (min/max каналов + LUT порога насыщенности) не быстрее:
+        # на области кнопки он на равных, на увеличенной - в 1.5-2 раза медленнее cvtColor
+        hsv = cv2.cvtColor(roi, cv2.COLOR_BGR2HSV)
+
+        # Маска для белого цвета (в масштабе остальных вариантов бинаризации)
+        white_mask = cv2.inRange(hsv, self.WHITE_HSV_LOWER, self.WHITE_HSV_UPPER)
+        white_mask = cv2.resize(white_mask, None, fx=self.OCR_SCALE, fy=self.OCR_SCALE,
+                                interpolation=cv2.INTER_NEAREST)
+
+        # Сохраняем для отладки
+        if self.debug_mode and self.attempt_counter % 20 == 1:
+            self._save_debug_image(white_mask, f"white_mask_{self.attempt_counter}.png")
+
+        return white_mask
 
     def _is_skip_text(self, text: str) -> bool:
         """
@@ -348,27 +898,23 @@ class UltraFastSkipButtonFinder:
         Returns:
             bool: True если это кнопка пропустить
         """
-        import re
-
         if not text:
             return False
 
         # Удаляем лишние символы и приводим к верхнему регистру
-        clean_text = re.sub(r'[^\w>»]', '', text.upper())
+        clean_text = self.CLEAN_TEXT_RE.sub('', text.upper())
 
         # Проверяем точные совпадения
-        for variant in self.skip_variants:
-            clean_variant = re.sub(r'[^\w>»]', '', variant.upper())
-            if clean_variant == clean_text:
-                self.logger.debug(f"✅ Найдено точное совпадение: '{text}' -> '{variant}'")
-                return True
+        if clean_text in self._clean_variants:
+            self.logger.debug(f"✅ Найдено точное совпадение: '{text}'")
+            return True
 
         # Проверяем частичные совпадения для длинного текста
         if len(clean_text) >= 6:  # Минимальная длина для "ПРОПУСТИТЬ"
-            for variant in ["ПРОПУСТИТЬ", "SKIP"]:
-                if variant in clean_text:
-                    self.logger.debug(f"✅ Найдено частичное совпадение: '{text}' содержит '{variant}'")
-                    return True
+            match = self.SKIP_WORD_RE.search(clean_text)
+            if match:
+                self.logger.debug(f"✅ Найдено частичное совпадение: '{text}' содержит '{match.group()}'")
+                return True
 
         # Проверяем стрелки
         if '>>' in text or '»' in text:
@@ -378,16 +924,49 @@ class UltraFastSkipButtonFinder:
         return False
 
     def _save_debug_image(self, image: np.ndarray, filename: str):
-        """Сохранение изображения для отладки."""
+        """
+        Сохранение изображения для отладки.
+        Кодирование PNG выполняется в фоновом потоке и не задерживает поиск.
+        """
         if not self.debug_mode:
             return
 
-        try:
-            filepath = self.debug_dir / filename
-            cv2.imwrite(str(filepath), image)
-            self.logger.debug(f"💾 Сохранено отладочное изображение: {filepath}")
-        except Exception as e:
-            self.logger.debug(f"Ошибка сохранения изображения: {e}")
+        if self._debug_thread is None or not self._debug_thread.is_alive():
+            self._debug_thread = threading.Thread(
+                target=self._debug_writer_loop, name="skip_debug_writer", daemon=True
+            )
+            self._debug_thread.start()
+            # Дописываем очередь до завершения интерпретатора: daemon-поток,
+            # прерванный внутри cv2.imwrite, аварийно завершает процесс.
+            # Обработчик регистрируется один раз, поток может перезапускаться
+            if not self._debug_exit_hook:
+                atexit.register(self._stop_debug_writer)
+                self._debug_exit_hook = True
+
+        # Копия обязательна: исходный массив может быть изменен до записи
+        self._debug_queue.put_nowait((f"{self._debug_prefix}{filename}", image.copy()))
+
+    def _debug_writer_loop(self):
+        """Фоновая запись отладочных изображений до получения None."""
+        while True:
+            item = self._debug_queue.get()
+            if item is None:
+                return
+
+            filepath, image = item
+            try:
+                # Низкое сжатие PNG: кодирование в разы быстрее, размер файла не важен
+                cv2.imwrite(filepath, image, [cv2.IMWRITE_PNG_COMPRESSION, 1])
+                self.logger.debug(f"💾 Сохранено отладочное изображение: {filepath}")
+            except Exception as e:
+                self.logger.debug(f"Ошибка сохранения изображения: {e}")
+
+    def _stop_debug_writer(self):
+        """Запись оставшихся в очереди изображений и остановка фонового потока."""
+        if self._debug_thread is not None and self._debug_thread.is_alive():
+            self._debug_queue.put(None)
+            self._debug_thread.join(timeout=5)
+        self._debug_thread = None
 
     def get_statistics(self) -> dict:
         """
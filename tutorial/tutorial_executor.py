@@ -2,17 +2,160 @@
 Исполнитель обучения - выполняет шаги согласно их конфигурации.
 Обновленная версия с оптимизированным поисковиком кнопки ПРОПУСТИТЬ.
 """
-import time
+import bisect
 import logging
-from typing import Dict, Any
-
-from .tutorial_steps import TutorialSteps, TutorialStep
+import subprocess
+import threading
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Callable, Iterable, List, NamedTuple, Optional, Tuple
+
+from config import SEASONS, PAUSE_SETTINGS
+from core.logger import log_step, log_success, log_failure
+from .tutorial_steps import TutorialSteps, TutorialStep, ACTION_TYPES, UNKNOWN_ACTION_ID
 from .skip_button_finder import UltraFastSkipButtonFinder
 
 
+def _build_season_intervals(seasons: dict) -> List[Tuple[int, int, str]]:
+    """
+    Построение непересекающихся интервалов серверов для поиска сезона бисекцией.
+
+    Диапазоны в конфигурации могут пересекаться (S3 и S4); как и при переборе
+    SEASONS по порядку, сервер принадлежит первому сезону, в диапазон которого попадает.
+
+    Args:
+        seasons: словарь сезонов в формате SEASONS
+
+    Returns:
+        list: (первый сервер, последний сервер, сезон), отсортированные по первому серверу
+    """
+    intervals = []
+    for season_id, season_data in seasons.items():
+        low, high = sorted((season_data['min_server'], season_data['max_server']))
+
+        # Вычитаем части диапазона, уже занятые предыдущими сезонами
+        pieces = [(low, high)]
+        for taken_low, taken_high, _ in intervals:
+            remaining = []
+            for piece_low, piece_high in pieces:
+                if taken_high < piece_low or taken_low > piece_high:
+                    remaining.append((piece_low, piece_high))
+                    continue
+                if piece_low < taken_low:
+                    remaining.append((piece_low, taken_low - 1))
+                if piece_high > taken_high:
+                    remaining.append((taken_high + 1, piece_high))
+            pieces = remaining
+
+        intervals.extend((piece_low, piece_high, season_id) for piece_low, piece_high in pieces)
+
+    return sorted(intervals)
+
+
+class TutorialCancelled(Exception):
+    """Выполнение обучения прервано вызовом TutorialExecutor.cancel()."""
+
+
+class ClickBatch(NamedTuple):
+    """Серия кликов по координатам, подготовленная при построении плана."""
+    steps: Tuple[TutorialStep, ...]
+    points: Tuple[Tuple[int, int, float], ...]  # (x, y, пауза перед кликом)
+    wait_after: float  # ожидание после последнего клика
+
+
+def _prepare_click_batch(steps: List[TutorialStep]) -> ClickBatch:
+    """
+    Перевод параметров шагов серии в готовые точки для click_batch.
+
+    Args:
+        steps: шаги серии (результат TutorialExecutor._collect_click_batch)
+
+    Returns:
+        ClickBatch: шаги, точки кликов и ожидание после серии
+    """
+    points = []
+    wait_before = 0.0
+    for step in steps:
+        params = step.params
+        points.append((step.x, step.y, wait_before + params.get('delay', 0.0)))
+        wait_before = step.wait_after
+    return ClickBatch(tuple(steps), tuple(points), wait_before)
+
+
+# Паузы вокруг клика по серверу (клик выполняется в цикле прокрутки списка)
+_BEFORE_SERVER_CLICK = PAUSE_SETTINGS['before_server_click']
+_AFTER_SERVER_CLICK = PAUSE_SETTINGS['after_server_click']
+
+# Паузы вокруг клика не длиннее этой выполняются на устройстве вместе с кликом
+# (в сериях кликов и при ожидании после клика); такая пауза не прерывается cancel()
+_MAX_FUSED_PAUSE = PAUSE_SETTINGS['max_batched_click_pause']
+
+# Время обязательного поиска ПРОПУСТИТЬ по умолчанию, в секундах
+DEFAULT_SKIP_TIMEOUT = 30
+
+_SEASON_INTERVALS = _build_season_intervals(SEASONS)
+_SEASON_LOWS = [low for low, _, _ in _SEASON_INTERVALS]
+
+
+def _closest_lower(server_ids: List[int], server_id: int) -> Optional[int]:
+    """
+    Ближайший сервер с номером ниже целевого (одна векторная операция вместо цикла).
+
+    Args:
+        server_ids: номера видимых серверов
+        server_id: номер целевого сервера
+
+    Returns:
+        int: номер ближайшего сервера ниже целевого или None
+    """
+    ids = np.fromiter(server_ids, dtype=np.int32, count=len(server_ids))
+    lower = ids[ids < server_id]
+    return int(lower.max()) if lower.size else None
+
+
+def _is_volatile(condition: Optional[Callable]) -> bool:
+    """
+    Проверка, зависит ли условие шага от состояния экрана.
+
+    Условия без атрибута volatile=True считаются зависящими только от конфигурации
+    и вычисляются один раз перед запуском обучения.
+
+    Args:
+        condition: условие шага
+
+    Returns:
+        bool: True если условие проверяется непосредственно перед шагом
+    """
+    return bool(getattr(condition, 'volatile', False))
+
+
 class TutorialExecutor:
     """Класс для выполнения шагов обучения согласно их конфигурации."""
 
+    # Клик по центру экрана при ожидании изображения и паузы между попытками
+    NUDGE_COORDS = (642, 334)
+    POLL_MIN_DELAY = 0.2
+    POLL_MAX_DELAY = 1.5
+    FORCED_NUDGE_EVERY = 3
+
+    # Суммарная разница яркости между скриншотами, ниже которой экран
+    # считается неизменившимся (шум сжатия, мигающий курсор и т.п.)
+    STATIC_FRAME_DIFF = 100_000
+
+    # Пауза после скроллинга списка серверов; предварительное распознавание
+    # кадра выполняется в фоне одновременно с ней
+    SCROLL_SETTLE = 0.5
+
+    # Распознавания списка серверов считаются совпавшими, если координаты
+    # каждого сервера отличаются не больше чем на столько пикселей
+    SCROLL_COORD_TOLERANCE = 5
+
+    # Сколько дополнительных распознаваний выполняется, пока два подряд не совпадут
+    SCROLL_MAX_REREADS = 3
+
+    # Действия, которые можно объединять в серию кликов одним вызовом ADB
+    BATCHABLE_ACTIONS = frozenset({'click_coord', 'click_coord_with_delay', 'click_coord_with_delay_and_wait'})
+
     def __init__(self, interface_controller, ocr_handler, server_selector, debug_mode=False):
         """
         Инициализация исполнителя обучения.
@@ -34,9 +177,34 @@ class TutorialExecutor:
         )
         self.tutorial_steps = TutorialSteps()
 
+        # Сезоны уже определенных серверов
+        self._season_cache = {}
+
+        # Последний скриншот при ожидании с кликами по центру экрана
+        self._last_frame = None
+
+        # Флаг отмены: все паузы исполнителя прерываются сразу после cancel()
+        self._cancel = threading.Event()
+
+        # Фоновая загрузка шаблонов изображений всех шагов: чтение с диска идет
+        # при запуске бота, пока выполняются первые шаги с их кликами и ожиданиями
+        self._template_prefetch_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="template_prefetch")
+        for image_key in sorted(self.tutorial_steps.get_all_image_keys()):
+            self._template_prefetch_pool.submit(self.interface.preload_template, image_key)
+
+        # Фоновое распознавание списка серверов после скроллинга
+        self._server_grab_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="server_grab")
+
+        # Таблица действий: action_id шага -> метод _action_<тип> (None, если метода нет)
+        self._handlers = tuple(getattr(self, f'_action_{action_type}', None) for action_type in ACTION_TYPES)
+
         # Валидация шагов при инициализации
         if not self.tutorial_steps.validate_steps():
             self.logger.warning("Обнаружены проблемы в конфигурации шагов")
+        self._validate_action_types()
+
+        # Запомненные планы выполнения по начальному шагу (см. _compile_plan)
+        self._compiled_plans = {}
 
     def execute_tutorial(self, server_id: int, start_step: int = 1) -> bool:
         """
@@ -51,32 +219,260 @@ class TutorialExecutor:
         """
         self.logger.info(f"Начало обучения на сервере {server_id} с шага {start_step}")
 
-        try:
-            # Получаем шаги для выполнения
-            steps_to_execute = self.tutorial_steps.get_steps_from_range(start_step, 97)
+        # Отмена, запрошенная после последней паузы прошлого запуска, не должна прерывать новый
+        self._cancel.clear()
 
-            for step in steps_to_execute:
-                self.logger.info(f"Выполняем шаг {step.step_number}: {step.description}")
+        try:
+            # Тип действия, параметры и условие каждого шага разрешаются один раз
+            # при построении плана; в цикле остаются только локальные переменные
+            for number, description, action, params, condition in self._plan(start_step, server_id):
+                if condition is not None and not condition():
+                    self.logger.info("Условие для шага %s не выполнено, пропускаем", number)
+                    continue
 
-                # Выполняем шаг с передачей server_id для шага выбора сервера
-                success = self._execute_step(step, server_id)
+                log_step(self.logger, number, description)
 
-                if not success:
-                    self.logger.error(f"Ошибка выполнения шага {step.step_number}")
+                if not self._run_action(number, action, params):
+                    self.logger.error("Ошибка выполнения шага %s", number)
                     return False
 
-                self.logger.info(f"Шаг {step.step_number}: ВЫПОЛНЕН")
-
             self.logger.info(f"Обучение на сервере {server_id} завершено успешно")
             return True
 
+        except TutorialCancelled:
+            self.logger.warning(f"Обучение на сервере {server_id} прервано")
+            return False
+
         except Exception as e:
             self.logger.error(f"Критическая ошибка выполнения обучения: {e}", exc_info=True)
             return False
 
+    def _plan(self, start_step: int, server_id: int = None) -> Tuple[Tuple, ...]:
+        """
+        План выполнения обучения для сервера.
+
+        Каждый элемент плана - кортеж (номер шага, описание, метод действия,
+        параметры, условие); для серии кликов номер шага - диапазон "первый-последний".
+        В плане остаются только условия, зависящие от состояния экрана (иначе None).
+
+        Args:
+            start_step: начальный шаг
+            server_id: номер сервера (для шага выбора сервера)
+
+        Returns:
+            tuple: элементы плана в порядке выполнения
+
+        Raises:
+            ValueError: если для шага нет метода действия
+        """
+        plan, server_slots = self._compiled_plans.get(start_step) or self._compile_plan(start_step)
+
+        if not server_id or not server_slots:
+            return plan
+
+        # server_id добавляется только для действия выбора сервера
+        plan = list(plan)
+        for index in server_slots:
+            number, description, action, params, condition = plan[index]
+            plan[index] = (number, description, action, {**params, 'server_id': server_id}, condition)
+        return tuple(plan)
+
+    def _compile_plan(self, start_step: int) -> Tuple[Tuple[Tuple, ...], Tuple[int, ...]]:
+        """
+        Построение плана, не зависящего от сервера.
+
+        Условия, не зависящие от экрана, проверяются здесь же, подряд идущие клики
+        по координатам объединяются в один элемент серии. План запоминается для
+        следующих серверов, если среди шагов нет таких условий (иначе их результат
+        может измениться, и план строится каждый раз).
+
+        Args:
+            start_step: начальный шаг
+
+        Returns:
+            tuple: (план, индексы элементов выбора сервера)
+
+        Raises:
+            ValueError: если для шага нет метода действия
+        """
+        steps, has_static_conditions = self._filter_by_conditions(
+            self.tutorial_steps.iter_steps_from_range(start_step, 97)
+        )
+
+        plan = []
+        server_slots = []
+        index = 0
+        while index < len(steps):
+            batch = self._collect_click_batch(steps, index)
+            if len(batch) > 1:
+                plan.append((f"{batch[0].step_number}-{batch[-1].step_number}", "серия кликов по координатам",
+                             self._execute_click_batch, {'batch': _prepare_click_batch(batch)}, None))
+                index += len(batch)
+                continue
+
+            step = steps[index]
+            index += 1
+
+            action = self._handler_for(step)
+            if action is None:
+                raise ValueError(f"Неизвестный тип действия: {step.action_type}")
+
+            if step.action_type == 'select_server':
+                server_slots.append(len(plan))
+
+            condition = step.condition if _is_volatile(step.condition) else None
+            plan.append((step.step_number, step.description, action, step.params, condition))
+
+        compiled = (tuple(plan), tuple(server_slots))
+        if not has_static_conditions:
+            self._compiled_plans[start_step] = compiled
+        return compiled
+
+    def _filter_by_conditions(self, steps: Iterable[TutorialStep]) -> Tuple[List[TutorialStep], bool]:
+        """
+        Однократная проверка условий шагов, не зависящих от состояния экрана.
+
+        Args:
+            steps: шаги для выполнения
+
+        Returns:
+            tuple: (шаги без тех, чье постоянное условие не выполнено,
+                    были ли среди шагов постоянные условия)
+        """
+        filtered = []
+        has_static_conditions = False
+        for step in steps:
+            if step.condition and not _is_volatile(step.condition):
+                has_static_conditions = True
+                if not step.condition():
+                    self.logger.info(f"Условие для шага {step.step_number} не выполнено, пропускаем")
+                    continue
+            filtered.append(step)
+        return filtered, has_static_conditions
+
+    def _validate_action_types(self) -> bool:
+        """
+        Проверка, что для каждого шага обучения есть метод действия.
+
+        Returns:
+            bool: True если все типы действий известны
+        """
+        unknown = sorted({
+            step.action_type for step in self.tutorial_steps.get_all_steps()
+            if self._handler_for(step) is None
+        })
+        if unknown:
+            self.logger.error(f"Неизвестные типы действий в шагах: {unknown}")
+            return False
+        return True
+
+    def _handler_for(self, step: TutorialStep) -> Optional[Callable[..., bool]]:
+        """
+        Получение метода действия шага по его action_id.
+
+        Args:
+            step: шаг обучения
+
+        Returns:
+            Callable: метод действия или None, если тип действия неизвестен
+        """
+        if step.action_id == UNKNOWN_ACTION_ID:
+            return None
+        return self._handlers[step.action_id]
+
+    def _collect_click_batch(self, steps: List[TutorialStep], start: int) -> List[TutorialStep]:
+        """
+        Сбор серии подряд идущих кликов по координатам, начиная с указанного шага.
+
+        Границей серии служат шаги с проверкой изображений, OCR, поиском ПРОПУСТИТЬ,
+        условием выполнения, а также паузы перед кликом длиннее _MAX_FUSED_PAUSE.
+
+        Args:
+            steps: шаги для выполнения
+            start: индекс первого шага серии
+
+        Returns:
+            list: шаги серии (пустой, если шаг start не является кликом по координатам)
+        """
+        batch = []
+        wait_before = 0.0
+
+        for step in steps[start:]:
+            if step.action_type not in self.BATCHABLE_ACTIONS or _is_volatile(step.condition):
+                break
+
+            # Пауза перед кликом: ожидание после предыдущего клика серии плюс задержка шага
+            if wait_before + step.params.get('delay', 0.0) > _MAX_FUSED_PAUSE:
+                break
+
+            batch.append(step)
+            wait_before = step.wait_after
+
+        return batch
+
+    def _execute_click_batch(self, batch: ClickBatch) -> bool:
+        """
+        Выполнение серии кликов по координатам одним вызовом ADB.
+
+        Если устройство не выполнило клик, остальные клики серии не запускаются:
+        начиная с невыполненного, шаги повторяются по одному.
+
+        Args:
+            batch: подготовленная серия (результат _prepare_click_batch)
+
+        Returns:
+            bool: успех выполнения серии
+        """
+        steps, points, wait_after = batch
+        for step in steps:
+            self.logger.info(f"  в серии шаг {step.step_number}: {step.description}")
+
+        try:
+            self.interface.click_batch(points)
+        except subprocess.CalledProcessError as e:
+            done = getattr(e, 'taps_done', 0)
+            self.logger.warning(f"Серия прервана на шаге {steps[done].step_number}, "
+                                f"оставшиеся шаги выполняются по одному")
+            if not self._execute_clicks_one_by_one(steps[done:], points[done:]):
+                return False
+        except Exception as e:
+            log_failure(self.logger, f"Ошибка выполнения серии шагов {steps[0].step_number}-{steps[-1].step_number}: {e}")
+            return False
+
+        # Ожидание после последнего клика серии выполняется как обычно
+        if wait_after > 0:
+            self.logger.info(f"Ожидание {wait_after} секунд после клика...")
+            self._sleep(wait_after)
+
+        return True
+
+    def _execute_clicks_one_by_one(self, steps: Tuple[TutorialStep, ...],
+                                   points: Tuple[Tuple[int, int, float], ...]) -> bool:
+        """
+        Выполнение кликов серии по одному (после ошибки в серии).
+
+        Args:
+            steps: шаги серии, которые еще не выполнены
+            points: точки кликов этих шагов
+
+        Returns:
+            bool: успех выполнения всех шагов
+        """
+        for step, point in zip(steps, points):
+            if self._cancel.is_set():
+                raise TutorialCancelled()
+
+            log_step(self.logger, step.step_number, step.description)
+            try:
+                self.interface.click_batch([point])
+            except Exception as e:
+                log_failure(self.logger, f"Ошибка выполнения шага {step.step_number}: {e}")
+                return False
+        return True
+
     def _execute_step(self, step: TutorialStep, server_id: int = None) -> bool:
         """
-        Выполнение одного шага обучения.
+        Выполнение одного шага обучения вне плана (например, отдельного тестового шага).
 
         Args:
             step: шаг для выполнения
@@ -85,44 +481,63 @@ class TutorialExecutor:
         Returns:
             bool: успех выполнения шага
         """
+        self._cancel.clear()
+
         try:
-            # Проверяем условие выполнения шага, если оно есть
+            # Проверяем условие выполнения шага
             if step.condition and not step.condition():
                 self.logger.info(f"Условие для шага {step.step_number} не выполнено, пропускаем")
                 return True
+        except Exception as e:
+            log_failure(self.logger, f"Ошибка выполнения шага {step.step_number}: {e}")
+            self.logger.error(f"Подробности: ", exc_info=True)
+            return False
 
-            # Используем новую функцию log_step вместо обычного логирования
-            from core.logger import log_step
-            log_step(self.logger, step.step_number, step.description)
+        log_step(self.logger, step.step_number, step.description)
 
-            # Выполняем шаг согласно его типу
-            action_method = getattr(self, f'_action_{step.action_type}', None)
-            if not action_method:
-                self.logger.error(f"Неизвестный тип действия: {step.action_type}")
-                return False
+        # Выполняем шаг согласно его типу
+        action_method = self._handler_for(step)
+        if not action_method:
+            self.logger.error(f"Неизвестный тип действия: {step.action_type}")
+            return False
 
-            # Добавляем server_id в параметры для действия выбора сервера
-            params = step.params.copy()
-            if step.action_type == 'select_server' and server_id:
-                params['server_id'] = server_id
+        # Параметры шага неизменяемы и передаются без копирования,
+        # server_id добавляется только для действия выбора сервера
+        params = step.params
+        if step.action_type == 'select_server' and server_id:
+            params = {**params, 'server_id': server_id}
 
-            success = action_method(**params)
+        return self._run_action(step.step_number, action_method, params)
 
-            # Логируем результат выполнения шага с цветным выделением
-            from core.logger import log_success, log_failure
-            if success:
-                log_success(self.logger, f"Шаг {step.step_number}: ВЫПОЛНЕН")
-            else:
-                log_failure(self.logger, f"Шаг {step.step_number}: НЕ ВЫПОЛНЕН")
+    def _run_action(self, step_number: Any, action: Callable[..., bool], params) -> bool:
+        """
+        Вызов метода действия шага с логированием результата.
 
-            return success
+        Args:
+            step_number: номер шага или диапазон шагов серии
+            action: метод действия
+            params: параметры действия
 
+        Returns:
+            bool: успех выполнения шага
+        """
+        try:
+            success = action(**params)
+        except TutorialCancelled:
+            raise
         except Exception as e:
-            from core.logger import log_failure
-            log_failure(self.logger, f"Ошибка выполнения шага {step.step_number}: {e}")
+            log_failure(self.logger, f"Ошибка выполнения шага {step_number}: {e}")
             self.logger.error(f"Подробности: ", exc_info=True)
             return False
 
+        # Логируем результат выполнения шага с цветным выделением
+        if success:
+            log_success(self.logger, f"Шаг {step_number}: ВЫПОЛНЕН")
+        else:
+            log_failure(self.logger, f"Шаг {step_number}: НЕ ВЫПОЛНЕН")
+
+        return success
+
     # Методы действий для различных типов шагов
 
     def _action_click_coord(self, x: int, y: int, **kwargs) -> bool:
@@ -138,10 +553,14 @@ class TutorialExecutor:
     def _action_click_coord_with_delay_and_wait(self, x: int, y: int, delay: float = 0.0,
                                                 wait_after: float = 0.0, **kwargs) -> bool:
         """Клик по координатам с задержкой и ожиданием после."""
-        self.interface.click_coord_with_delay(x, y, delay)
+        # Короткие паузы выполняются на устройстве вместе с кликом
+        pause_after = wait_after if self._fusable(delay, wait_after) else 0.0
+        self.interface.click_coord_with_delay(x, y, delay, pause_after=pause_after)
+
         if wait_after > 0:
             self.logger.info(f"Ожидание {wait_after} секунд после клика...")
-            time.sleep(wait_after)
+        if wait_after > pause_after:
+            self._sleep(wait_after)
         return True
 
     def _action_select_server(self, server_id: int, **kwargs) -> bool:
@@ -159,25 +578,25 @@ class TutorialExecutor:
         # Ищем и выбираем сервер
         return self._find_and_click_server(server_id)
 
-    def _action_find_skip_infinite(self, wait_after: float = 0.0, **kwargs) -> bool:
+    def _action_find_skip_infinite(self, wait_after: float = 0.0,
+                                   skip_timeout: float = DEFAULT_SKIP_TIMEOUT, **kwargs) -> bool:
         """
-        Бесконечный поиск кнопки ПРОПУСТИТЬ с оптимизированным алгоритмом.
+        Обязательный поиск кнопки ПРОПУСТИТЬ с оптимизированным алгоритмом.
 
-        ВАЖНО: Этот метод НЕ завершается пока не найдет кнопку!
-        Никаких fallback-ов на координаты!
+        ВАЖНО: Никаких fallback-ов на координаты! Если кнопка не найдена
+        за skip_timeout секунд, шаг завершается с ошибкой.
         """
         self.logger.info("🔍 Поиск кнопки ПРОПУСТИТЬ (обязательный поиск)")
 
-        success = self.skip_finder.find_skip_button_infinite()
+        success = self.skip_finder.find_skip_button(timeout=skip_timeout)
 
         if success:
             self.logger.info("✅ ПРОПУСТИТЬ найден и нажат")
             if wait_after > 0:
-                time.sleep(wait_after)
+                self._sleep(wait_after)
             return True
         else:
-            # Этого не должно произойти при бесконечном поиске
-            self.logger.error("❌ Критическая ошибка: бесконечный поиск завершился без результата")
+            self.logger.error(f"❌ ПРОПУСТИТЬ не найден за {skip_timeout}с")
             return False
 
     def _action_click_with_image_check(self, image_key: str, x: int, y: int,
@@ -188,16 +607,21 @@ class TutorialExecutor:
     def _action_click_with_image_check_and_wait(self, image_key: str, x: int, y: int,
                                                 image_timeout: int = 15, wait_after: float = 0.0, **kwargs) -> bool:
         """Ожидание изображения, клик и ожидание после."""
-        success = self.interface.click_with_image_check(image_key, x, y, image_timeout)
-        if wait_after > 0:
-            time.sleep(wait_after)
+        # Короткое ожидание после клика выполняется на устройстве вместе с кликом
+        pause_after = wait_after if self._fusable(wait_after) else 0.0
+        success = self.interface.click_with_image_check(image_key, x, y, image_timeout, pause_after=pause_after)
+
+        if wait_after > pause_after:
+            self._sleep(wait_after)
         return success
 
-    def _action_wait_image_then_skip(self, image_key: str, image_timeout: int = 15, **kwargs) -> bool:
+    def _action_wait_image_then_skip(self, image_key: str, image_timeout: int = 15,
+                                     skip_timeout: float = DEFAULT_SKIP_TIMEOUT, **kwargs) -> bool:
         """
         Ожидание изображения и затем ОБЯЗАТЕЛЬНЫЙ поиск кнопки ПРОПУСТИТЬ.
 
         ВАЖНО: Поиск ПРОПУСТИТЬ обязательный, без fallback-ов!
+        Время поиска ограничено skip_timeout секундами.
         """
         # Ждем изображение
         if self.interface.wait_for_image(image_key, timeout=image_timeout):
@@ -206,18 +630,14 @@ class TutorialExecutor:
             self.logger.warning(f"Изображение {image_key} не найдено, но запускаем поиск ПРОПУСТИТЬ")
 
         # ОБЯЗАТЕЛЬНЫЙ поиск ПРОПУСТИТЬ
-        return self.skip_finder.find_skip_button_infinite()
+        return self.skip_finder.find_skip_button(timeout=skip_timeout)
 
     def _action_wait_for_battle_ready(self, image_key: str, max_attempts: int = 20, **kwargs) -> bool:
         """Ожидание готовности к битве."""
-        for attempt in range(max_attempts):
-            self.logger.debug(f"Попытка {attempt + 1}/{max_attempts} - ищем {image_key}")
-            if self.interface.click_image(image_key, timeout=1):
-                self.logger.info(f"{image_key} найден и нажат на попытке {attempt + 1}")
-                return True
-            self.logger.debug(f"{image_key} не найден, кликаем по центру экрана")
-            self.interface.click_coord(642, 334)
-            time.sleep(1.5)
+        if self._poll_with_nudges(lambda: self.interface.click_image(image_key, timeout=1),
+                                  image_key, max_attempts):
+            self.logger.info(f"{image_key} найден и нажат")
+            return True
 
         self.logger.warning(f"{image_key} не найден за {max_attempts} попыток")
         return True  # Продолжаем выполнение
@@ -225,24 +645,21 @@ class TutorialExecutor:
     def _action_wait_for_ship(self, image_key: str, max_attempts: int = 20,
                               click_x: int = 93, click_y: int = 285, **kwargs) -> bool:
         """Ожидание корабля."""
-        for attempt in range(max_attempts):
-            self.logger.debug(f"Попытка {attempt + 1}/{max_attempts} - ищем {image_key}")
-            if self.interface.wait_for_image(image_key, timeout=1):
-                self.logger.info(f"{image_key} найден на попытке {attempt + 1}, кликаем по ({click_x}, {click_y})")
-                self.interface.click_coord(click_x, click_y)
-                return True
-            self.logger.debug(f"{image_key} не найден, кликаем по центру экрана")
-            self.interface.click_coord(642, 334)
-            time.sleep(1.5)
+        if self._poll_with_nudges(lambda: self.interface.wait_for_image(image_key, timeout=1),
+                                  image_key, max_attempts):
+            self.logger.info(f"{image_key} найден, кликаем по ({click_x}, {click_y})")
+            self.interface.click_coord(click_x, click_y)
+            return True
 
         self.logger.warning(f"{image_key} не найден за {max_attempts} попыток, кликаем по квесту")
         self.interface.click_coord(click_x, click_y)
         return True  # Продолжаем выполнение
 
     def _action_find_and_click_text(self, text: str, region: tuple, timeout: int = 5,
-                                    fallback_x: int = None, fallback_y: int = None, **kwargs) -> bool:
+                                    fallback_x: int = None, fallback_y: int = None,
+                                    volatile_region: bool = False, **kwargs) -> bool:
         """Поиск и клик по тексту с резервными координатами."""
-        if not self.ocr.find_and_click_text(text, region, timeout):
+        if not self.ocr.find_and_click_text(text, region, timeout, volatile_region):
             if fallback_x and fallback_y:
                 self.logger.warning(f'Текст "{text}" не найден, кликаем по резервным координатам')
                 self.interface.click_coord(fallback_x, fallback_y)
@@ -264,17 +681,14 @@ class TutorialExecutor:
                                           wait_after: float = 0.0, **kwargs) -> bool:
         """Ожидание, поиск изображения, клик и ожидание после."""
         if wait_before > 0:
-            time.sleep(wait_before)
+            self._sleep(wait_before)
 
-        if self.interface.wait_for_image(image_key, timeout=image_timeout):
-            self.logger.info(f"Изображение {image_key} найдено, выполняем клик по ({x}, {y})")
-            self.interface.click_coord(x, y)
-        else:
-            self.logger.warning(f"Изображение {image_key} не найдено, выполняем клик по координатам")
-            self.interface.click_coord(x, y)
+        # Короткое ожидание после клика выполняется на устройстве вместе с кликом
+        pause_after = wait_after if self._fusable(wait_after) else 0.0
+        self.interface.click_with_image_check(image_key, x, y, image_timeout, pause_after=pause_after)
 
-        if wait_after > 0:
-            time.sleep(wait_after)
+        if wait_after > pause_after:
+            self._sleep(wait_after)
         return True
 
     def _action_final_quest_activation(self, x: int, y: int, wait_before: float = 6,
@@ -285,13 +699,16 @@ class TutorialExecutor:
         ВАЖНО: Если ПРОПУСТИТЬ найден, то он ОБЯЗАТЕЛЬНО будет нажат!
         """
         if wait_before > 0:
-            time.sleep(wait_before)
+            self._sleep(wait_before)
 
         # Проверяем наличие кнопки ПРОПУСТИТЬ с ограниченным таймаутом
-        if self.skip_finder.find_skip_button_with_timeout(timeout=skip_timeout):
+        if self.skip_finder.find_skip_button(timeout=skip_timeout):
             self.logger.info('✅ ПРОПУСТИТЬ найден и нажат, ждем перед активацией квеста')
-            time.sleep(wait_after_skip)
-            self.interface.click_coord(x, y)
+            if self._fusable(wait_after_skip):
+                self.interface.click_batch([(x, y, wait_after_skip)])
+            else:
+                self._sleep(wait_after_skip)
+                self.interface.click_coord(x, y)
             self.logger.info('Финальный квест активирован (после ПРОПУСТИТЬ)')
         else:
             self.logger.info('ПРОПУСТИТЬ не найден за отведенное время, сразу активируем финальный квест')
@@ -302,14 +719,116 @@ class TutorialExecutor:
 
     # Вспомогательные методы
 
+    def _fusable(self, *pauses: float) -> bool:
+        """
+        Проверка, можно ли выполнить паузы вокруг клика на устройстве одним вызовом ADB.
+
+        Args:
+            *pauses: паузы перед кликом и после него в секундах
+
+        Returns:
+            bool: True если суммарная пауза не длиннее _MAX_FUSED_PAUSE
+        """
+        return sum(pauses) <= _MAX_FUSED_PAUSE
+
+    def close(self) -> None:
+        """Освобождение ресурсов: фоновые пулы потоков и поисковик кнопки ПРОПУСТИТЬ."""
+        self._template_prefetch_pool.shutdown(wait=False, cancel_futures=True)
+        self._server_grab_pool.shutdown(wait=False, cancel_futures=True)
+        self.skip_finder.close()
+
+    def cancel(self) -> None:
+        """Прерывание выполнения обучения (можно вызывать из другого потока)."""
+        self.logger.info("Запрошена отмена выполнения обучения")
+        self._cancel.set()
+
+    def _sleep(self, seconds: float) -> None:
+        """
+        Пауза, прерываемая отменой обучения.
+
+        Args:
+            seconds: длительность паузы в секундах
+
+        Raises:
+            TutorialCancelled: если во время паузы вызван cancel()
+        """
+        if self._cancel.wait(seconds):
+            raise TutorialCancelled()
+
+    def _poll_with_nudges(self, probe: Callable[[], Any], image_key: str, max_attempts: int) -> bool:
+        """
+        Повторная проверка с кликами по центру экрана и растущей паузой между попытками.
+
+        Клик по центру пропускается, если экран не изменился с прошлой попытки
+        (игра еще не отреагировала на предыдущий клик), но не чаще чем
+        FORCED_NUDGE_EVERY попыток подряд.
+
+        Args:
+            probe: проверка, возвращающая истинное значение при успехе
+            image_key: ключ изображения (для логов)
+            max_attempts: максимальное количество попыток
+
+        Returns:
+            bool: True если проверка прошла успешно
+        """
+        delay = self.POLL_MIN_DELAY
+        skipped_nudges = 0
+        self._last_frame = None
+
+        for attempt in range(max_attempts):
+            self.logger.debug("Попытка %d/%d - ищем %s", attempt + 1, max_attempts, image_key)
+            if probe():
+                self.logger.debug("%s найден на попытке %d", image_key, attempt + 1)
+                return True
+
+            if self._screen_changed() or skipped_nudges + 1 >= self.FORCED_NUDGE_EVERY:
+                self.logger.debug("%s не найден, кликаем по центру экрана", image_key)
+                self.interface.click_coord(*self.NUDGE_COORDS)
+                skipped_nudges = 0
+            else:
+                self.logger.debug("%s не найден, экран не изменился - клик пропущен", image_key)
+                skipped_nudges += 1
+
+            self._sleep(delay)
+            delay = min(delay * 1.5, self.POLL_MAX_DELAY)
+
+        return False
+
+    def _screen_changed(self) -> bool:
+        """
+        Проверка, изменился ли последний скриншот с прошлого вызова.
+
+        Разница считается одним векторным проходом NumPy по кадру, поэтому
+        мелкие изменения пикселей (ниже STATIC_FRAME_DIFF) не считаются изменением экрана.
+
+        Returns:
+            bool: True если скриншот изменился (или сравнить не с чем)
+        """
+        screenshot = self.interface.image.last_screenshot
+        if screenshot is None:
+            return True
+
+        previous, self._last_frame = self._last_frame, screenshot
+        if previous is None or previous.shape != screenshot.shape:
+            return True
+
+        diff = np.abs(screenshot.astype(np.int16) - previous.astype(np.int16)).sum()
+        return diff >= self.STATIC_FRAME_DIFF
+
     def _determine_season_for_server(self, server_id: int) -> str:
         """Определение сезона для сервера."""
-        from config import SEASONS
+        if server_id in self._season_cache:
+            return self._season_cache[server_id]
 
-        for season_id, season_data in SEASONS.items():
-            if season_data['min_server'] >= server_id >= season_data['max_server']:
-                return season_id
-        return None
+        season_id = None
+        index = bisect.bisect_right(_SEASON_LOWS, server_id) - 1
+        if index >= 0:
+            _, high, candidate = _SEASON_INTERVALS[index]
+            if server_id <= high:
+                season_id = candidate
+
+        self._season_cache[server_id] = season_id
+        return season_id
 
     def _find_and_click_server(self, server_id: int) -> bool:
         """Поиск и клик по серверу с улучшенной логикой."""
@@ -350,9 +869,8 @@ class TutorialExecutor:
                 self.logger.info(
                     f"Сервер {server_id} не найден, но находится между видимыми серверами {min_server} и {max_server}")
                 # Выбираем ближайший сервер НИЖЕ целевого
-                lower_servers = [s for s in current_servers_list if s < server_id]
-                if lower_servers:
-                    closest_lower = max(lower_servers)  # Ближайший снизу
+                closest_lower = _closest_lower(current_servers_list, server_id)
+                if closest_lower is not None:
                     difference = server_id - closest_lower
                     self.logger.info(f"Выбираем ближайший сервер НИЖЕ: {closest_lower} (разница: {difference})")
                     coords = current_servers[closest_lower]
@@ -362,7 +880,7 @@ class TutorialExecutor:
         # Основной цикл скроллинга - выполняем до 10 попыток, если не нашли ближайшие серверы
         max_attempts = 10
         for attempt in range(max_attempts):
-            self.logger.info(f"Попытка скроллинга {attempt + 1}/{max_attempts}")
+            self.logger.info("Попытка скроллинга %d/%d", attempt + 1, max_attempts)
 
             # Определяем тип скроллинга
             scroll_result = self.server_selector.scroll_to_server_range(server_id, current_servers_list)
@@ -374,8 +892,7 @@ class TutorialExecutor:
                     return True
 
             # Получаем новый список серверов после скроллинга
-            time.sleep(0.5)
-            new_servers = self.server_selector.get_servers_with_coordinates(force_refresh=True)
+            new_servers = self._grab_servers_after_scroll()
             if new_servers:
                 current_servers_list = list(new_servers.keys())
 
@@ -394,9 +911,8 @@ class TutorialExecutor:
                     self.logger.info(
                         f"После скроллинга найдены сервера по обе стороны от {server_id}: {min_server}-{max_server}")
                     # Выбираем ближайший сервер НИЖЕ целевого
-                    lower_servers = [s for s in current_servers_list if s < server_id]
-                    if lower_servers:
-                        closest_lower = max(lower_servers)  # Ближайший снизу
+                    closest_lower = _closest_lower(current_servers_list, server_id)
+                    if closest_lower is not None:
                         difference = server_id - closest_lower
                         self.logger.info(f"Выбираем ближайший сервер НИЖЕ: {closest_lower} (разница: {difference})")
                         coords = new_servers[closest_lower]
@@ -407,12 +923,10 @@ class TutorialExecutor:
 
         # Если не удалось найти точный сервер, выбираем ближайший НИЖЕ
         if current_servers_list:
-            # Ищем сервера с номерами НИЖЕ целевого
-            lower_servers = [s for s in current_servers_list if s < server_id]
+            # Ищем ближайший сервер с номером НИЖЕ целевого
+            closest_lower = _closest_lower(current_servers_list, server_id)
 
-            if lower_servers:
-                # Берем максимальный из серверов ниже целевого (т.е. ближайший)
-                closest_lower = max(lower_servers)
+            if closest_lower is not None:
                 difference = server_id - closest_lower
                 self.logger.info(f"Выбираем ближайший сервер НИЖЕ: {closest_lower} (разница: {difference})")
                 final_servers = self.server_selector.get_servers_with_coordinates()
@@ -435,13 +949,58 @@ class TutorialExecutor:
         self.logger.error(f"Не удалось найти подходящий сервер для {server_id}")
         return False
 
+    def _grab_servers_after_scroll(self) -> Dict[int, Tuple[int, int]]:
+        """
+        Распознавание списка серверов после скроллинга.
+
+        Снимок и OCR запускаются в фоне сразу после скроллинга и идут одновременно
+        с паузой SCROLL_SETTLE. Кадр может быть снят во время анимации прокрутки,
+        поэтому его результат служит только подсказкой: координаты принимаются,
+        когда два распознавания подряд (подсказка и чтение после паузы или два
+        чтения после паузы) дают одинаковый список.
+
+        Returns:
+            dict: словарь {server_id: (click_x, click_y)}
+        """
+        grab = self._server_grab_pool.submit(self.server_selector.get_servers_with_coordinates, True)
+        self._sleep(self.SCROLL_SETTLE)
+
+        servers = grab.result()
+
+        for _ in range(self.SCROLL_MAX_REREADS):
+            settled = self.server_selector.get_servers_with_coordinates(force_refresh=True)
+            if self._same_servers(servers, settled):
+                return settled
+            self.logger.debug("Список серверов еще меняется после скроллинга, повторяем распознавание")
+            servers = settled
+
+        self.logger.warning("Список серверов не стабилизировался после скроллинга")
+        return servers
+
+    def _same_servers(self, first: Dict[int, Tuple[int, int]], second: Dict[int, Tuple[int, int]]) -> bool:
+        """
+        Проверка, что два распознавания списка серверов совпадают.
+
+        Args:
+            first: словарь {server_id: (click_x, click_y)}
+            second: словарь {server_id: (click_x, click_y)}
+
+        Returns:
+            bool: True если серверы одинаковые и их координаты почти не отличаются
+        """
+        if not first or not second or first.keys() != second.keys():
+            return False
+
+        tolerance = self.SCROLL_COORD_TOLERANCE
+        return all(abs(first[server][0] - second[server][0]) <= tolerance and
+                   abs(first[server][1] - second[server][1]) <= tolerance
+                   for server in first)
+
     def _click_server_at_coordinates(self, coords: tuple) -> None:
         """Клик по серверу с паузами."""
-        from config import PAUSE_SETTINGS
-
-        time.sleep(PAUSE_SETTINGS['before_server_click'])
+        self._sleep(_BEFORE_SERVER_CLICK)
         self.interface.click_coord(coords[0], coords[1])
-        time.sleep(PAUSE_SETTINGS['after_server_click'])
+        self._sleep(_AFTER_SERVER_CLICK)
 
     def get_skip_finder_statistics(self) -> dict:
         """
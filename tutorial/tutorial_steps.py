@@ -1,769 +1,569 @@
 """
 Определение и конфигурация шагов обучения.
 """
+import bisect
 import logging
-from dataclasses import dataclass
-from typing import List, Optional, Callable, Any
-
-
-@dataclass
+import sys
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import List, Optional, Callable, Any, Mapping, Tuple, FrozenSet, Iterator
+
+logger = logging.getLogger('sea_conquest_bot.tutorial_steps')
+
+
+# Поддерживаемые типы действий; индекс типа в кортеже - идентификатор действия
+# (action_id), по которому исполнитель выбирает метод без сравнения строк
+ACTION_TYPES = (
+    'click_coord',
+    'click_coord_with_delay',
+    'click_coord_with_delay_and_wait',
+    'select_server',
+    'find_skip_infinite',
+    'click_with_image_check',
+    'click_with_image_check_and_wait',
+    'wait_image_then_skip',
+    'wait_for_battle_ready',
+    'wait_for_ship',
+    'find_and_click_text',
+    'click_image_or_coord',
+    'wait_image_click_and_wait',
+    'final_quest_activation',
+)
+_ACTION_IDS = {action_type: action_id for action_id, action_type in enumerate(ACTION_TYPES)}
+UNKNOWN_ACTION_ID = -1
+
+# Обязательные параметры действий (без значений по умолчанию в обработчиках исполнителя).
+# server_id для select_server подставляется при выполнении и в таблице не задается
+_REQUIRED_PARAMS = {
+    'click_coord': ('x', 'y'),
+    'click_coord_with_delay': ('x', 'y'),
+    'click_coord_with_delay_and_wait': ('x', 'y'),
+    'select_server': (),
+    'find_skip_infinite': (),
+    'click_with_image_check': ('image_key', 'x', 'y'),
+    'click_with_image_check_and_wait': ('image_key', 'x', 'y'),
+    'wait_image_then_skip': ('image_key',),
+    'wait_for_battle_ready': ('image_key',),
+    'wait_for_ship': ('image_key',),
+    'find_and_click_text': ('text', 'region'),
+    'click_image_or_coord': ('image_key', 'x', 'y'),
+    'wait_image_click_and_wait': ('image_key', 'x', 'y'),
+    'final_quest_activation': ('x', 'y'),
+}
+
+# Номера шагов, ожидаемые в конфигурации (шаги 1-97)
+_EXPECTED_STEPS = frozenset(range(1, 98))
+
+# Общие неизменяемые параметры: шаги с одинаковыми параметрами ссылаются на один объект
+_EMPTY_PARAMS = MappingProxyType({})
+_PARAMS_POOL = {}
+
+
+def _shared_params(params: Mapping[str, Any]) -> Mapping[str, Any]:
+    """
+    Получение общего неизменяемого представления параметров шага.
+
+    Args:
+        params: параметры шага
+
+    Returns:
+        MappingProxyType: параметры только для чтения (один объект для равных параметров)
+    """
+    if not params:
+        return _EMPTY_PARAMS
+
+    # Ключ учитывает тип значения: 1 и 1.0 равны, но шаги должны получать свои значения как есть
+    key = tuple(sorted((name, type(value), value) for name, value in params.items()))
+    try:
+        shared = _PARAMS_POOL.get(key)
+    except TypeError:
+        # Нехешируемые значения - параметры шага не разделяются
+        return MappingProxyType(dict(params))
+
+    if shared is None:
+        # Строковые значения (ключи изображений, тексты) интернируются, как и тип действия
+        shared = _PARAMS_POOL[key] = MappingProxyType({
+            name: sys.intern(value) if type(value) is str else value
+            for name, value in params.items()
+        })
+    return shared
+
+
+@dataclass(frozen=True, slots=True)
 class TutorialStep:
-    """Класс для описания одного шага обучения."""
+    """Класс для описания одного шага обучения (неизменяемый, хешируемый, без __dict__)."""
     step_number: int
     description: str
     action_type: str
-    params: dict
+    params: Mapping[str, Any] = field(hash=False)
     condition: Optional[Callable] = None
+    action_id: int = field(default=UNKNOWN_ACTION_ID, init=False, repr=False, compare=False)
+    x: Optional[int] = field(default=None, init=False, repr=False, compare=False)
+    y: Optional[int] = field(default=None, init=False, repr=False, compare=False)
+    image_key: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    wait_after: float = field(default=0.0, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        """
+        Параметры шага доступны только для чтения: действия не могут их изменить.
+        Равные параметры разделяются между шагами, тип действия интернируется
+        и заранее переводится в идентификатор действия. Часто читаемые параметры
+        (x, y, image_key, wait_after) дублируются в полях шага.
+        """
+        object.__setattr__(self, 'action_type', sys.intern(self.action_type))
+        object.__setattr__(self, 'action_id', _ACTION_IDS.get(self.action_type, UNKNOWN_ACTION_ID))
+        if not isinstance(self.params, MappingProxyType):
+            object.__setattr__(self, 'params', _shared_params(self.params))
+        params = self.params
+        object.__setattr__(self, 'x', params.get('x'))
+        object.__setattr__(self, 'y', params.get('y'))
+        object.__setattr__(self, 'image_key', params.get('image_key'))
+        object.__setattr__(self, 'wait_after', params.get('wait_after', 0.0))
+
+
+def _skip(number: int, image_key: str, wait_after: float, description: str = None) -> tuple:
+    """
+    Строка таблицы шагов: ждем изображение и нажимаем ПРОПУСТИТЬ (1169, 42).
+
+    Args:
+        number: номер шага
+        image_key: ключ изображения в IMAGE_PATHS
+        wait_after: ожидание после клика в секундах
+        description: описание шага, если оно отличается от стандартного
+
+    Returns:
+        tuple: (номер, описание, тип действия, параметры)
+    """
+    if description is None:
+        description = f"Ждем изображения {image_key}, когда находим кликаем 1169:42 (скип)"
+    return (number, description, "click_with_image_check_and_wait",
+            {"image_key": image_key, "x": 1169, "y": 42, "image_timeout": 40, "wait_after": wait_after})
+
+
+def _tap(number: int, x: int, y: int, wait_after: float, purpose: str) -> tuple:
+    """
+    Строка таблицы шагов: клик по координатам без задержки и ожидание после него.
+
+    Args:
+        number: номер шага
+        x: координата x
+        y: координата y
+        wait_after: ожидание после клика в секундах
+        purpose: назначение клика (для описания шага)
+
+    Returns:
+        tuple: (номер, описание, тип действия, параметры)
+    """
+    return (number, f"клик {x}:{y} ({purpose})", "click_coord_with_delay_and_wait",
+            {"x": x, "y": y, "delay": 0, "wait_after": wait_after})
+
+
+# Шаги обучения согласно ТЗ: (номер, описание, тип действия, параметры);
+# типовые шаги записаны через _skip и _tap
+_STEP_TABLE = (
+    # НАЧАЛЬНЫЕ ШАГИ (1-6)
+    (1, "Клик по координатам (52, 50) - открываем профиль",
+     "click_coord", {"x": 52, "y": 50}),
+
+    (2, "Ждем 1.5 сек и открываем настройки",
+     "click_coord_with_delay", {"x": 1076, "y": 31, "delay": 1.5}),
+
+    (3, "Ждем 1.5 сек и открываем вкладку персонажей",
+     "click_coord_with_delay", {"x": 643, "y": 319, "delay": 1.5}),
+
+    (4, "Ждем 1.5 сек и создаем персонажа на новом сервере",
+     "click_coord_with_delay", {"x": 271, "y": 181, "delay": 1.5}),
+
+    (5, "Выбор сервера",
+     "select_server", {}),
+
+    (6, "Ждем 2.5 сек и подтверждаем создание персонажа + ждем загрузки 17 сек",
+     "click_coord_with_delay_and_wait", {"x": 787, "y": 499, "delay": 2.5, "wait_after": 17}),
+
+    # ОСНОВНЫЕ ШАГИ (7-97)
+
+    # Шаги 7-9: Пропустить
+    _skip(7, "step_7_skip_hell_henry", 0.25,
+          "Ждем изображения step_7_skip_hell_henry.png, когда находим кликаем 1169:42 (скип)"),
+
+    _skip(8, "step_8_skip_ship_word", 0.25,
+          "Ждем изображения step_8_skip_ship_word.png, когда находим кликаем 1169:42 (скип)"),
+
+    _skip(9, "step_9_skip_shark_word", 1.0,
+          "Ждем изображения step_9_skip_shark_word.png, когда находим кликаем 1169:42 (скип)"),
+
+    # Шаг 10: Активация боя
+    (10, "Ждем изображения step_10_face.png, когда находим кликаем 710:448 (активируем пушку)",
+     "click_with_image_check_and_wait", {"image_key": "step_10_face", "x": 710, "y": 448, "image_timeout": 40, "wait_after": 1}),
+
+    # Шаг 11: Пропустить
+    _skip(11, "step_11_skip", 2,
+          "Ждем изображения step_11_skip.png, когда находим кликаем 1169:42 (скип)"),
+
+    # Шаг 12: Пропустить
+    _skip(12, "step_12_skip", 1,
+          "Ждем изображения step_12_skip.png, когда находим кликаем 1169:42 (скип)"),
+
+    # Шаг 13: Клик по иконке кораблика
+    (13, "Ждем изображения step_13.png, когда находим кликаем 58:654 (Нажимаем на иконку кораблика)",
+     "click_with_image_check_and_wait", {"image_key": "step_13", "x": 58, "y": 654, "image_timeout": 40, "wait_after": 0.25}),
+
+    # Шаг 14: Пропустить
+    _skip(14, "step_14_skip", 1,
+          "Ждем изображения step_14_skip.png, когда находим кликаем 1169:42 (скип)"),
+
+    # Шаг 15: Нижняя палуба
+    (15, "Ждем изображения step_15, клик 638:403, задержка 0,5 сек после клика (отстраиваем нижнюю палубу)",
+     "click_with_image_check_and_wait", {"image_key": "step_15", "x": 638, "y": 403, "image_timeout": 40, "wait_after": 1.5}),
+
+    # Шаг 16: Паб в нижней палубе
+    (16, "Ждем изображения step_16, когда находим кликаем 635:373, тайм слип 0,5 сек (Отстраиваем паб в нижней палубе)",
+     "click_with_image_check_and_wait", {"image_key": "step_16", "x": 635, "y": 373, "image_timeout": 40, "wait_after": 1.5}),
+
+    # Шаг 17: Латаем дыры в складе
+    (17, "Ждем изображения step_17, когда находим кликаем 635:373 (Латаем дыры в складе)",
+     "click_with_image_check_and_wait", {"image_key": "step_17", "x": 635, "y": 373, "image_timeout": 40, "wait_after": 1.5}),
+
+    # Шаг 18: Пропустить
+    _skip(18, "step_18", 0.25),
+
+    # Шаг 19: Верхняя палуба
+    (19, "Ждем изображения step_19, когда находим кликаем 345:386 (Отстраиваем верхнюю палубу)",
+     "click_with_image_check_and_wait", {"image_key": "step_19", "x": 345, "y": 386, "image_timeout": 40, "wait_after": 0.25}),
+
+    # Шаг 20: Выбираем пушку
+    (20, "Ждем изображения step_20, когда находим кликаем 77:276 (Выбираем пушку)",
+     "click_with_image_check_and_wait", {"image_key": "step_20", "x": 77, "y": 276, "image_timeout": 40, "wait_after": 0.25}),
+
+    # Шаг 21: Пропустить
+    _skip(21, "step_21", 0.25),
+
+    # Шаг 22: Сбор предметов
+    (22, "Ждем изображения step_22, когда находим кликаем 741:145 (квест - собираем предметы)",
+     "click_with_image_check_and_wait", {"image_key": "step_22", "x": 741, "y": 145, "image_timeout": 40, "wait_after": 0.25}),
+
+    # Шаг 23: Пропустить
+    _skip(23, "step_21", 0.25),
+
+    # Шаг 24: Квест "Старый соперник"
+    (24, "Ждем изображения step_24, когда находим кликаем 93:285 (Начинаем квест 'Старый соперник')",
+     "click_with_image_check_and_wait", {"image_key": "step_24", "x": 93, "y": 285, "image_timeout": 40, "wait_after": 0.25}),
+
+    # Шаг 25: Пропустить
+    _skip(25, "step_18", 0.25),
+
+    # Шаг 26: Повторная активация квеста "Старый соперник"
+    (26, "Ждем изображения step_26, когда находим кликаем 93:285 (Повторно активируем квест 'Старый соперник')",
+     "click_with_image_check_and_wait", {"image_key": "step_26", "x": 93, "y": 285, "image_timeout": 40, "wait_after": 0.25}),
+
+    # Шаг 27: Пропустить
+    _skip(27, "step_27", 1),
+
+    # Шаг 28: Пропустить
+    _skip(28, "step_27", 0.25),
+
+    # Шаг 29: Продолжить после победы
+    (29, "Ждем изображения step_29, когда находим кликаем 630:413 (Продолжаем после победы - клик по центру экрана)",
+     "click_with_image_check_and_wait", {"image_key": "step_29", "x": 630, "y": 413, "image_timeout": 40, "wait_after": 0.25}),
+
+    # Шаг 30: Пропустить
+    _skip(30, "step_21", 0.25),
+
+    # Шаг 31: Активируем компас
+    (31, "Ждем изображения step_31, когда находим кликаем 1074:88 (Активируем компас)",
+     "click_with_image_check_and_wait", {"image_key": "step_31", "x": 1074, "y": 88, "image_timeout": 40, "wait_after": 0.25}),
+
+    # Шаг 32: Повторно активируем компас
+    (32, "Ждем изображения step_32, когда находим кликаем 701:258 (Повторно активируем компас)",
+     "click_with_image_check_and_wait", {"image_key": "step_32", "x": 701, "y": 258, "image_timeout": 40, "wait_after": 0.25}),
+
+    # Шаг 33: Пропустить
+    _skip(33, "step_27", 0.25),
+
+    # Шаг 34: Выход из вкладки компаса
+    (34, "Ждем изображения step_34, когда находим кликаем 145:25 (Выходим из вкладки компаса)",
+     "click_with_image_check_and_wait", {"image_key": "step_34", "x": 145, "y": 25, "image_timeout": 40, "wait_after": 0.25}),
+
+    # Шаг 35: Пропустить
+    _skip(35, "step_27", 1.5,
+          "Ждем изображения step_27, когда находим кликаем 1169:42, тайм слип 1.5 сек (скип)"),
+
+    # Шаг 36: Активация квеста "Далекая песня"
+    _tap(36, 93, 285, 0.25, "Активируем квест 'Далекая песня'"),
+
+    # Шаг 37: Пропустить
+    _skip(37, "step_18", 1.5,
+          "Ждем изображения step_18, когда находим кликаем 1169:42, тайм слип 1.5 сек (скип)"),
+
+    # Шаг 38: Повторная активация квеста "Далекая песня"
+    _tap(38, 93, 285, 0.25, "Повторно активируем квест 'Далекая песня'"),
+
+    # Шаг 39: Пропустить
+    _skip(39, "step_39", 0.25),
+
+    # Шаг 40: Согласие на обмен
+    (40, "Ждем изображения step_40, когда находим кликаем 151:349 (Соглашаемся на обмен)",
+     "click_with_image_check_and_wait", {"image_key": "step_40", "x": 151, "y": 349, "image_timeout": 40, "wait_after": 0.25}),
+
+    # Шаг 41: Пропустить
+    _skip(41, "step_21", 0.25),
+
+    # Шаг 42: Исследование залива Мертвецов
+    (42, "Ждем изображения step_24, когда находим кликаем 93:285 (Начинаем исследование залива Мертвецов)",
+     "click_with_image_check_and_wait", {"image_key": "step_24", "x": 93, "y": 285, "image_timeout": 40, "wait_after": 0.25}),
+
+    # Шаг 43: Пропустить
+    _skip(43, "step_21", 0.25),
+
+    # Шаг 44: Подготовка к битве
+    (44, "Ждем изображения step_44, когда находим кликаем 85:634, тайм слип 1.5 сек (Подготавливаемся к битве)",
+     "click_with_image_check_and_wait", {"image_key": "step_44", "x": 85, "y": 634, "image_timeout": 40, "wait_after": 1.5}),
+
+    # Шаг 45: Начало битвы
+    _tap(45, 1157, 604, 2, "начинаем битву"),
+
+    # Шаг 46: Дожидаемся готовности к битве
+    (46, "Дожидаемся готовности к битве - ищем step_46",
+     "wait_for_battle_ready", {"image_key": "step_46", "max_attempts": 20}),
+
+    # Шаг 47: Дожидаемся корабля
+    (47, "Продолжаем кликать по центру экрана, пока не увидим step_48, когда находим кликаем 136:283",
+     "wait_for_ship", {"image_key": "step_48", "click_x": 136, "click_y": 283, "max_attempts": 30}),
+
+    # Шаг 48: Пропустить
+    _skip(48, "step_27", 0.25),
+
+    # Шаг 49: Активируем следующий этап квеста
+    (49, "Ждем изображения step_50, когда находим кликаем 136:283 (Активируем следующий этап квеста)",
+     "click_with_image_check_and_wait", {"image_key": "step_50", "x": 136, "y": 283, "image_timeout": 40, "wait_after": 0.25}),
+
+    # Шаг 50: Пропустить
+    _skip(50, "step_27", 3.5,
+          "Ждем изображения step_27, когда находим кликаем 1169:42, тайм слип 3 сек (скип)"),
+
+    # Шаг 51: Активация черепа
+    _tap(51, 653, 403, 1.0, "Активируем череп в заливе мертвецов"),
+
+    # Шаг 52: Пропустить
+    _skip(52, "step_18", 2.0,
+          "Ждем изображения step_18, когда находим кликаем 1169:42,тайм слип 2 сек (скип)"),
+
+    # Шаг 53: Пропустить
+    _skip(53, "step_18", 2.0),
+
+    # Шаг 54: Пропустить
+    _skip(54, "step_55", 2.5,
+          "Ждем изображения step_55, когда находим кликаем 1169:42, тайм слип 2 сек (скип)"),
+
+    # Шаг 55: Пропустить
+    _skip(55, "step_55", 2.0),
+
+    # Шаг 56: Пропустить
+    _skip(56, "step_21", 0.25),
+
+    # Шаг 57: Продолжить квест
+    (57, "Ждем изображения step_48, когда находим кликаем 136:283 (Продолжаем квест - 'покинуть залив мертвецов')",
+     "click_with_image_check_and_wait", {"image_key": "step_48", "x": 136, "y": 283, "image_timeout": 40, "wait_after": 0.25}),
+
+    # Шаг 58: Пропустить
+    _skip(58, "step_27", 0.25),
+
+    # Шаг 59: Открытие вкладки корабля
+    (59, "Ждем изображения step_60, когда находим кликаем 125:283 (Открываем вкладку корабля)",
+     "click_with_image_check_and_wait", {"image_key": "step_60", "x": 125, "y": 283, "image_timeout": 40, "wait_after": 1}),
+
+    # Шаг 60: Открытие вкладки построек
+    (60, "Ждем изображения step_61, когда находим кликаем 42:479 (заходим во вкладку построек)",
+     "click_with_image_check_and_wait", {"image_key": "step_61", "x": 42, "y": 479, "image_timeout": 40, "wait_after": 1}),
+
+    # Шаг 61: Выбор корабля для улучшения
+    (61, "Ждем изображения step_62, когда находим кликаем 127:216 (Выбираем корабль для улучшения)",
+     "click_with_image_check_and_wait", {"image_key": "step_62", "x": 127, "y": 216, "image_timeout": 40, "wait_after": 1}),
+
+    # Шаг 62: Улучшение корабля
+    (62, "Ждем изображения step_63, когда находим кликаем 1079:646, тайм слип 2.5 сек (Улучшаем корабль)",
+     "click_with_image_check_and_wait", {"image_key": "step_63", "x": 1079, "y": 646, "image_timeout": 40, "wait_after": 3.5}),
+
+    # Шаг 63: Выход из вкладки корабля
+    _tap(63, 145, 25, 2, "Выходим из вкладки корабля"),
+
+    # Шаг 64: Открытие меню постройки
+    (64, "Ждем изображения step_61, когда находим кликаем 639:603 (Открываем меню постройки)",
+     "click_with_image_check_and_wait", {"image_key": "step_61", "x": 639, "y": 603, "image_timeout": 40, "wait_after": 1}),
+
+    # Шаг 65: Пропустить
+    _skip(65, "step_21", 1),
+
+    # Шаг 66: Открытие компаса
+    (66, "Ждем изображения step_61, когда находим кликаем 1072:87, тайм слип 3 (Открываем вкладку компаса)",
+     "click_with_image_check_and_wait", {"image_key": "step_61", "x": 1072, "y": 87, "image_timeout": 40, "wait_after": 9}),
+
+    # Шаг 67: Открытие вкладки строительства
+    (67, "Ждем изображения step_68, когда находим кликаем 43:481 (открываем вкладку строительства)",
+     "click_with_image_check_and_wait", {"image_key": "step_68", "x": 43, "y": 481, "image_timeout": 40, "wait_after": 2}),
+
+    # Шаг 68: Выбор постройки
+    (68, "Ждем изображения step_69, когда находим кликаем 983:405 (выбираем постройку - каюта гребцов)",
+     "click_with_image_check_and_wait", {"image_key": "step_69", "x": 983, "y": 405, "image_timeout": 40, "wait_after": 2.5}),
+
+    # Шаг 69: Подтверждение постройки
+    (69, "Ждем изображения step_68, когда находим кликаем 676:580, тайм слип 4.5 сек (Подтверждаем постройку каюты гребцов)",
+     "click_with_image_check_and_wait", {"image_key": "step_68", "x": 676, "y": 580, "image_timeout": 40, "wait_after": 4.5}),
+
+    # Шаг 70: Активация квеста
+    (70, "клик 123:280, тайм слип 3 сек (Активируем квест 'Заполучи кают гребцов: 1')",
+     "click_coord_with_delay_and_wait", {"x": 123, "y": 280, "delay": 0, "wait_after": 3.0}),
+
+    # Шаг 71: Открытие вкладки построек
+    _tap(71, 42, 479, 3, "открываем вкладку построек"),
+
+    # Шаг 72: Выбор орудийной палубы
+    (72, "Ждем изображения step_69, когда находим кликаем 687:514 (Выбираем орудийную палубу)",
+     "click_with_image_check_and_wait", {"image_key": "step_69", "x": 687, "y": 514, "image_timeout": 40, "wait_after": 3}),
+
+    # Шаг 73: Подтверждение постройки орудийной палубы
+    (73, "Ждем изображения step_68, когда находим кликаем 679:581, тайм слип 4.5 сек (Подтверждаем постройку орудийной палубы)",
+     "click_with_image_check_and_wait", {"image_key": "step_68", "x": 679, "y": 581, "image_timeout": 40, "wait_after": 5.5}),
+
+    # Шаг 74: Завершение квеста орудийных палуб
+    (74, "клик 119:279, тайм слип 2 сек (Завершаем квест орудийных палуб)",
+     "click_coord_with_delay_and_wait", {"x": 119, "y": 279, "delay": 0, "wait_after": 3.5}),
+
+    # Шаг 75: Нажимаем на квест с компасом
+    (75, "клик 119:279, тайм слип 2 сек (Нажимаем на квест с компасом)",
+     "click_coord_with_delay_and_wait", {"x": 119, "y": 279, "delay": 0, "wait_after": 1.5}),
+
+    # Шаг 76: Открытие компаса
+    _tap(76, 1072, 87, 2, "Открываем компас"),
+
+    # Шаг 77: Активация указателя
+    (77, "Ждем изображения step_77, когда находим кликаем 698:273 (Активируем указатель)",
+     "click_with_image_check_and_wait", {"image_key": "step_77", "x": 698, "y": 273, "image_timeout": 40, "wait_after": 2}),
+
+    # Шаг 78: Пропустить
+    _skip(78, "step_27", 1),
+
+    # Шаг 79: Активация компаса над кораблем
+    (79, "Ждем изображения step_79, когда находим кликаем 652:214 (Активируем компас над кораблем)",
+     "click_with_image_check_and_wait", {"image_key": "step_79", "x": 652, "y": 214, "image_timeout": 40, "wait_after": 0.25}),
+
+    # Шаг 80: Пропустить
+    _skip(80, "step_27", 4.5),
+
+    # Шаг 81: Пропустить
+    _skip(81, "step_21", 1.5,
+          "Ждем изображения step_21, когда находим кликаем 1169:42, тайм слип 1 сек (скип)"),
+
+    # Шаг 82: Пропустить
+    (82, "Ждем изображения step_21, когда находим кликаем 1169:42, тайм слип 1 сек (скип)",
+     "click_with_image_check_and_wait", {"image_key": "step_21", "x": 1169, "y": 42, "image_timeout": 40, "click_delay": 1.5,
+                    "wait_after": 1.5}),
+
+    # Шаг 83: Активация квеста "Богатая добыча"
+    (83, "Ждем изображения step_82, когда находим кликаем 151:280 (Активируем квест 'Богатая добыча')",
+     "click_with_image_check_and_wait", {"image_key": "step_82", "x": 151, "y": 280, "image_timeout": 40, "wait_after": 0.25}),
+
+    # Шаг 84: Пропустить
+    _skip(84, "step_27", 0.5),
+
+    # Шаг 85: Пропустить
+    _skip(85, "step_84", 0.25),
+
+    # Шаг 86: Пропустить
+    _skip(86, "step_85", 2.0,
+          "Ждем изображения step_85, когда находим кликаем 1169:42, тайм слип 1 сек (скип)"),
+
+    # Шаг 87: Пропустить
+    _skip(87, "step_85", 2.0),
+
+    # Шаг 88: Сбор монет
+    (88, "Ждем изображения step_87, когда находим кликаем 931:620 (Собираем монеты)",
+     "click_with_image_check_and_wait", {"image_key": "step_87", "x": 931, "y": 620, "image_timeout": 40, "wait_after": 2.0}),
+
+    # Шаг 89: Пропустить
+    _skip(89, "step_88", 1.0),
+
+    # Шаг 90: Пропустить
+    (90, "Ждем изображения step_89, когда находим кликаем 150:277 (скип)",
+     "click_with_image_check_and_wait", {"image_key": "step_89", "x": 150, "y": 277, "image_timeout": 40, "wait_after": 0.25}),
+)
+
+
+# Шаги строятся один раз при импорте модуля и общие для всех экземпляров TutorialSteps
+_ALL_STEPS = tuple(TutorialStep(number, description, action_type, params)
+                   for number, description, action_type, params in _STEP_TABLE)
+
+# Индекс шагов по номеру и отсортированные номера для выборки диапазонов
+_STEPS_BY_NUMBER = {step.step_number: step for step in _ALL_STEPS}
+_SORTED_NUMBERS = tuple(sorted(_STEPS_BY_NUMBER))
+
+# Шаги, сгруппированные по типу действия (в порядке определения)
+_STEPS_BY_ACTION = {}
+for _step in _ALL_STEPS:
+    _STEPS_BY_ACTION.setdefault(_step.action_type, []).append(_step)
+del _step
+
+# Шаги, сгруппированные по ожидаемому изображению (в порядке определения)
+_STEPS_BY_IMAGE = {}
+for _step in _ALL_STEPS:
+    if _step.image_key is not None:
+        _STEPS_BY_IMAGE.setdefault(_step.image_key, []).append(_step)
+del _step
+
+# Все изображения, которые ожидаются в шагах
+_IMAGE_KEYS = frozenset(_STEPS_BY_IMAGE)
+
+# Шаги без обязательных параметров (проверяются один раз при импорте, а не при выполнении)
+_MISSING_PARAMS = []
+for _step in _ALL_STEPS:
+    _missing = [name for name in _REQUIRED_PARAMS.get(_step.action_type, ()) if name not in _step.params]
+    if _missing:
+        _MISSING_PARAMS.append((_step.step_number, _missing))
+_MISSING_PARAMS = tuple(_MISSING_PARAMS)
+del _step, _missing
 
 
 class TutorialSteps:
     """Класс для управления и определения всех шагов обучения."""
 
     def __init__(self):
-        """Инициализация конфигурации шагов."""
-        self.logger = logging.getLogger('sea_conquest_bot.tutorial_steps')
-        self._steps = self._define_all_steps()
+        """Инициализация конфигурации шагов (шаги и индексы уже построены при импорте)."""
+        self._steps = _ALL_STEPS
+        self._by_number = _STEPS_BY_NUMBER
+        self._sorted_numbers = _SORTED_NUMBERS
+        self._by_action = _STEPS_BY_ACTION
+        self._by_image = _STEPS_BY_IMAGE
+        self._image_keys = _IMAGE_KEYS
 
-    def _define_all_steps(self) -> List[TutorialStep]:
+    def get_steps_from_range(self, start_step: int, end_step: int = 97) -> List[TutorialStep]:
         """
-        Определение всех шагов обучения согласно ТЗ.
+        Получение шагов в указанном диапазоне.
+
+        Args:
+            start_step: начальный шаг
+            end_step: конечный шаг
 
         Returns:
-            list: список шагов обучения
+            list: список шагов в диапазоне
         """
-        steps = []
-
-        # НАЧАЛЬНЫЕ ШАГИ (1-6)
-        steps.append(TutorialStep(
-            step_number=1,
-            description="Клик по координатам (52, 50) - открываем профиль",
-            action_type="click_coord",
-            params={"x": 52, "y": 50}
-        ))
-
-        steps.append(TutorialStep(
-            step_number=2,
-            description="Ждем 1.5 сек и открываем настройки",
-            action_type="click_coord_with_delay",
-            params={"x": 1076, "y": 31, "delay": 1.5}
-        ))
-
-        steps.append(TutorialStep(
-            step_number=3,
-            description="Ждем 1.5 сек и открываем вкладку персонажей",
-            action_type="click_coord_with_delay",
-            params={"x": 643, "y": 319, "delay": 1.5}
-        ))
-
-        steps.append(TutorialStep(
-            step_number=4,
-            description="Ждем 1.5 сек и создаем персонажа на новом сервере",
-            action_type="click_coord_with_delay",
-            params={"x": 271, "y": 181, "delay": 1.5}
-        ))
-
-        steps.append(TutorialStep(
-            step_number=5,
-            description="Выбор сервера",
-            action_type="select_server",
-            params={}
-        ))
-
-        steps.append(TutorialStep(
-            step_number=6,
-            description="Ждем 2.5 сек и подтверждаем создание персонажа + ждем загрузки 17 сек",
-            action_type="click_coord_with_delay_and_wait",
-            params={"x": 787, "y": 499, "delay": 2.5, "wait_after": 17}
-        ))
-
-        # ОСНОВНЫЕ ШАГИ (7-97)
-
-        # Шаги 7-9: Пропустить
-        steps.append(TutorialStep(
-            step_number=7,
-            description="Ждем изображения step_7_skip_hell_henry.png, когда находим кликаем 1169:42 (скип)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_7_skip_hell_henry", "x": 1169, "y": 42, "image_timeout": 40, "wait_after": 0.25}
-        ))
-
-        steps.append(TutorialStep(
-            step_number=8,
-            description="Ждем изображения step_8_skip_ship_word.png, когда находим кликаем 1169:42 (скип)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_8_skip_ship_word", "x": 1169, "y": 42, "image_timeout": 40, "wait_after": 0.25}
-        ))
-
-        steps.append(TutorialStep(
-            step_number=9,
-            description="Ждем изображения step_9_skip_shark_word.png, когда находим кликаем 1169:42 (скип)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_9_skip_shark_word", "x": 1169, "y": 42, "image_timeout": 40, "wait_after": 1.0}
-        ))
-
-        # Шаг 10: Активация боя
-        steps.append(TutorialStep(
-            step_number=10,
-            description="Ждем изображения step_10_face.png, когда находим кликаем 710:448 (активируем пушку)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_10_face", "x": 710, "y": 448, "image_timeout": 40, "wait_after": 1}
-        ))
-
-        # Шаг 11: Пропустить
-        steps.append(TutorialStep(
-            step_number=11,
-            description="Ждем изображения step_11_skip.png, когда находим кликаем 1169:42 (скип)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_11_skip", "x": 1169, "y": 42, "image_timeout": 40, "wait_after": 2}
-        ))
-
-        # Шаг 12: Пропустить
-        steps.append(TutorialStep(
-            step_number=12,
-            description="Ждем изображения step_12_skip.png, когда находим кликаем 1169:42 (скип)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_12_skip", "x": 1169, "y": 42, "image_timeout": 40, "wait_after": 1}
-        ))
-
-        # Шаг 13: Клик по иконке кораблика
-        steps.append(TutorialStep(
-            step_number=13,
-            description="Ждем изображения step_13.png, когда находим кликаем 58:654 (Нажимаем на иконку кораблика)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_13", "x": 58, "y": 654, "image_timeout": 40, "wait_after": 0.25}
-        ))
-
-        # Шаг 14: Пропустить
-        steps.append(TutorialStep(
-            step_number=14,
-            description="Ждем изображения step_14_skip.png, когда находим кликаем 1169:42 (скип)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_14_skip", "x": 1169, "y": 42, "image_timeout": 40, "wait_after": 1}
-        ))
-
-        # Шаг 15: Нижняя палуба
-        steps.append(TutorialStep(
-            step_number=15,
-            description="Ждем изображения step_15, клик 638:403, задержка 0,5 сек после клика (отстраиваем нижнюю палубу)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_15", "x": 638, "y": 403, "image_timeout": 40, "wait_after": 1.5}
-        ))
-
-        # Шаг 16: Паб в нижней палубе
-        steps.append(TutorialStep(
-            step_number=16,
-            description="Ждем изображения step_16, когда находим кликаем 635:373, тайм слип 0,5 сек (Отстраиваем паб в нижней палубе)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_16", "x": 635, "y": 373, "image_timeout": 40, "wait_after": 1.5}
-        ))
-
-        # Шаг 17: Латаем дыры в складе
-        steps.append(TutorialStep(
-            step_number=17,
-            description="Ждем изображения step_17, когда находим кликаем 635:373 (Латаем дыры в складе)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_17", "x": 635, "y": 373, "image_timeout": 40, "wait_after": 1.5}
-        ))
-
-        # Шаг 18: Пропустить
-        steps.append(TutorialStep(
-            step_number=18,
-            description="Ждем изображения step_18, когда находим кликаем 1169:42 (скип)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_18", "x": 1169, "y": 42, "image_timeout": 40, "wait_after": 0.25}
-        ))
-
-        # Шаг 19: Верхняя палуба
-        steps.append(TutorialStep(
-            step_number=19,
-            description="Ждем изображения step_19, когда находим кликаем 345:386 (Отстраиваем верхнюю палубу)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_19", "x": 345, "y": 386, "image_timeout": 40, "wait_after": 0.25}
-        ))
-
-        # Шаг 20: Выбираем пушку
-        steps.append(TutorialStep(
-            step_number=20,
-            description="Ждем изображения step_20, когда находим кликаем 77:276 (Выбираем пушку)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_20", "x": 77, "y": 276, "image_timeout": 40, "wait_after": 0.25}
-        ))
-
-        # Шаг 21: Пропустить
-        steps.append(TutorialStep(
-            step_number=21,
-            description="Ждем изображения step_21, когда находим кликаем 1169:42 (скип)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_21", "x": 1169, "y": 42, "image_timeout": 40, "wait_after": 0.25}
-        ))
-
-        # Шаг 22: Сбор предметов
-        steps.append(TutorialStep(
-            step_number=22,
-            description="Ждем изображения step_22, когда находим кликаем 741:145 (квест - собираем предметы)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_22", "x": 741, "y": 145, "image_timeout": 40, "wait_after": 0.25}
-        ))
-
-        # Шаг 23: Пропустить
-        steps.append(TutorialStep(
-            step_number=23,
-            description="Ждем изображения step_21, когда находим кликаем 1169:42 (скип)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_21", "x": 1169, "y": 42, "image_timeout": 40, "wait_after": 0.25}
-        ))
-
-        # Шаг 24: Квест "Старый соперник"
-        steps.append(TutorialStep(
-            step_number=24,
-            description="Ждем изображения step_24, когда находим кликаем 93:285 (Начинаем квест 'Старый соперник')",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_24", "x": 93, "y": 285, "image_timeout": 40, "wait_after": 0.25}
-        ))
-
-        # Шаг 25: Пропустить
-        steps.append(TutorialStep(
-            step_number=25,
-            description="Ждем изображения step_18, когда находим кликаем 1169:42 (скип)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_18", "x": 1169, "y": 42, "image_timeout": 40, "wait_after": 0.25}
-        ))
-
-        # Шаг 26: Повторная активация квеста "Старый соперник"
-        steps.append(TutorialStep(
-            step_number=26,
-            description="Ждем изображения step_26, когда находим кликаем 93:285 (Повторно активируем квест 'Старый соперник')",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_26", "x": 93, "y": 285, "image_timeout": 40, "wait_after": 0.25}
-        ))
-
-        # Шаг 27: Пропустить
-        steps.append(TutorialStep(
-            step_number=27,
-            description="Ждем изображения step_27, когда находим кликаем 1169:42 (скип)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_27", "x": 1169, "y": 42, "image_timeout": 40, "wait_after": 1}
-        ))
-
-        # Шаг 28: Пропустить
-        steps.append(TutorialStep(
-            step_number=28,
-            description="Ждем изображения step_27, когда находим кликаем 1169:42 (скип)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_27", "x": 1169, "y": 42, "image_timeout": 40, "wait_after": 0.25}
-        ))
-
-        # Шаг 29: Продолжить после победы
-        steps.append(TutorialStep(
-            step_number=29,
-            description="Ждем изображения step_29, когда находим кликаем 630:413 (Продолжаем после победы - клик по центру экрана)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_29", "x": 630, "y": 413, "image_timeout": 40, "wait_after": 0.25}
-        ))
-
-        # Шаг 30: Пропустить
-        steps.append(TutorialStep(
-            step_number=30,
-            description="Ждем изображения step_21, когда находим кликаем 1169:42 (скип)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_21", "x": 1169, "y": 42, "image_timeout": 40, "wait_after": 0.25}
-        ))
-
-        # Шаг 31: Активируем компас
-        steps.append(TutorialStep(
-            step_number=31,
-            description="Ждем изображения step_31, когда находим кликаем 1074:88 (Активируем компас)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_31", "x": 1074, "y": 88, "image_timeout": 40, "wait_after": 0.25}
-        ))
-
-        # Шаг 32: Повторно активируем компас
-        steps.append(TutorialStep(
-            step_number=32,
-            description="Ждем изображения step_32, когда находим кликаем 701:258 (Повторно активируем компас)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_32", "x": 701, "y": 258, "image_timeout": 40, "wait_after": 0.25}
-        ))
-
-        # Шаг 33: Пропустить
-        steps.append(TutorialStep(
-            step_number=33,
-            description="Ждем изображения step_27, когда находим кликаем 1169:42 (скип)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_27", "x": 1169, "y": 42, "image_timeout": 40, "wait_after": 0.25}
-        ))
-
-        # Шаг 34: Выход из вкладки компаса
-        steps.append(TutorialStep(
-            step_number=34,
-            description="Ждем изображения step_34, когда находим кликаем 145:25 (Выходим из вкладки компаса)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_34", "x": 145, "y": 25, "image_timeout": 40, "wait_after": 0.25}
-        ))
-
-        # Шаг 35: Пропустить
-        steps.append(TutorialStep(
-            step_number=35,
-            description="Ждем изображения step_27, когда находим кликаем 1169:42, тайм слип 1.5 сек (скип)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_27", "x": 1169, "y": 42, "image_timeout": 40, "wait_after": 1.5}
-        ))
-
-        # Шаг 36: Активация квеста "Далекая песня"
-        steps.append(TutorialStep(
-            step_number=36,
-            description="клик 93:285 (Активируем квест 'Далекая песня')",
-            action_type="click_coord_with_delay_and_wait",
-            params={"x": 93, "y": 285, "delay": 0, "wait_after": 0.25}
-        ))
-
-        # Шаг 37: Пропустить
-        steps.append(TutorialStep(
-            step_number=37,
-            description="Ждем изображения step_18, когда находим кликаем 1169:42, тайм слип 1.5 сек (скип)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_18", "x": 1169, "y": 42, "image_timeout": 40, "wait_after": 1.5}
-        ))
-
-        # Шаг 38: Повторная активация квеста "Далекая песня"
-        steps.append(TutorialStep(
-            step_number=38,
-            description="клик 93:285 (Повторно активируем квест 'Далекая песня')",
-            action_type="click_coord_with_delay_and_wait",
-            params={"x": 93, "y": 285, "delay": 0, "wait_after": 0.25}
-        ))
-
-        # Шаг 39: Пропустить
-        steps.append(TutorialStep(
-            step_number=39,
-            description="Ждем изображения step_39, когда находим кликаем 1169:42 (скип)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_39", "x": 1169, "y": 42, "image_timeout": 40, "wait_after": 0.25}
-        ))
-
-        # Шаг 40: Согласие на обмен
-        steps.append(TutorialStep(
-            step_number=40,
-            description="Ждем изображения step_40, когда находим кликаем 151:349 (Соглашаемся на обмен)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_40", "x": 151, "y": 349, "image_timeout": 40, "wait_after": 0.25}
-        ))
-
-        # Шаг 41: Пропустить
-        steps.append(TutorialStep(
-            step_number=41,
-            description="Ждем изображения step_21, когда находим кликаем 1169:42 (скип)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_21", "x": 1169, "y": 42, "image_timeout": 40, "wait_after": 0.25}
-        ))
-
-        # Шаг 42: Исследование залива Мертвецов
-        steps.append(TutorialStep(
-            step_number=42,
-            description="Ждем изображения step_24, когда находим кликаем 93:285 (Начинаем исследование залива Мертвецов)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_24", "x": 93, "y": 285, "image_timeout": 40, "wait_after": 0.25}
-        ))
-
-        # Шаг 43: Пропустить
-        steps.append(TutorialStep(
-            step_number=43,
-            description="Ждем изображения step_21, когда находим кликаем 1169:42 (скип)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_21", "x": 1169, "y": 42, "image_timeout": 40, "wait_after": 0.25}
-        ))
-
-        # Шаг 44: Подготовка к битве
-        steps.append(TutorialStep(
-            step_number=44,
-            description="Ждем изображения step_44, когда находим кликаем 85:634, тайм слип 1.5 сек (Подготавливаемся к битве)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_44", "x": 85, "y": 634, "image_timeout": 40, "wait_after": 1.5}
-        ))
-
-        # Шаг 45: Начало битвы
-        steps.append(TutorialStep(
-            step_number=45,
-            description="клик 1157:604 (начинаем битву)",
-            action_type="click_coord_with_delay_and_wait",
-            params={"x": 1157, "y": 604, "delay": 0, "wait_after": 2}
-        ))
-
-        # Шаг 46: Дожидаемся готовности к битве
-        steps.append(TutorialStep(
-            step_number=46,
-            description="Дожидаемся готовности к битве - ищем step_46",
-            action_type="wait_for_battle_ready",
-            params={"image_key": "step_46", "max_attempts": 20}
-        ))
-
-        # Шаг 47: Дожидаемся корабля
-        steps.append(TutorialStep(
-            step_number=47,
-            description="Продолжаем кликать по центру экрана, пока не увидим step_48, когда находим кликаем 136:283",
-            action_type="wait_for_ship",
-            params={"image_key": "step_48", "click_x": 136, "click_y": 283, "max_attempts": 30}
-        ))
-
-        # Шаг 48: Пропустить
-        steps.append(TutorialStep(
-            step_number=48,
-            description="Ждем изображения step_27, когда находим кликаем 1169:42 (скип)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_27", "x": 1169, "y": 42, "image_timeout": 40, "wait_after": 0.25}
-        ))
-
-        # Шаг 49: Активируем следующий этап квеста
-        steps.append(TutorialStep(
-            step_number=49,
-            description="Ждем изображения step_50, когда находим кликаем 136:283 (Активируем следующий этап квеста)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_50", "x": 136, "y": 283, "image_timeout": 40, "wait_after": 0.25}
-        ))
-
-        # Шаг 50: Пропустить
-        steps.append(TutorialStep(
-            step_number=50,
-            description="Ждем изображения step_27, когда находим кликаем 1169:42, тайм слип 3 сек (скип)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_27", "x": 1169, "y": 42, "image_timeout": 40, "wait_after": 3.5}
-        ))
-
-        # Шаг 51: Активация черепа
-        steps.append(TutorialStep(
-            step_number=51,
-            description="клик 653:403 (Активируем череп в заливе мертвецов)",
-            action_type="click_coord_with_delay_and_wait",
-            params={"x": 653, "y": 403, "delay": 0, "wait_after": 1.0}
-        ))
-
-        # Шаг 52: Пропустить
-        steps.append(TutorialStep(
-            step_number=52,
-            description="Ждем изображения step_18, когда находим кликаем 1169:42,тайм слип 2 сек (скип)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_18", "x": 1169, "y": 42, "image_timeout": 40, "wait_after": 2.0}
-        ))
-
-        # Шаг 53: Пропустить
-        steps.append(TutorialStep(
-            step_number=53,
-            description="Ждем изображения step_18, когда находим кликаем 1169:42 (скип)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_18", "x": 1169, "y": 42, "image_timeout": 40, "wait_after": 2.0}
-        ))
-
-        # Шаг 54: Пропустить
-        steps.append(TutorialStep(
-            step_number=54,
-            description="Ждем изображения step_55, когда находим кликаем 1169:42, тайм слип 2 сек (скип)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_55", "x": 1169, "y": 42, "image_timeout": 40, "wait_after": 2.5}
-        ))
-
-        # Шаг 55: Пропустить
-        steps.append(TutorialStep(
-            step_number=55,
-            description="Ждем изображения step_55, когда находим кликаем 1169:42 (скип)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_55", "x": 1169, "y": 42, "image_timeout": 40, "wait_after": 2.0}
-        ))
-
-        # Шаг 56: Пропустить
-        steps.append(TutorialStep(
-            step_number=56,
-            description="Ждем изображения step_21, когда находим кликаем 1169:42 (скип)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_21", "x": 1169, "y": 42, "image_timeout": 40, "wait_after": 0.25}
-        ))
-
-        # Шаг 57: Продолжить квест
-        steps.append(TutorialStep(
-            step_number=57,
-            description="Ждем изображения step_48, когда находим кликаем 136:283 (Продолжаем квест - 'покинуть залив мертвецов')",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_48", "x": 136, "y": 283, "image_timeout": 40, "wait_after": 0.25}
-        ))
-
-        # Шаг 58: Пропустить
-        steps.append(TutorialStep(
-            step_number=58,
-            description="Ждем изображения step_27, когда находим кликаем 1169:42 (скип)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_27", "x": 1169, "y": 42, "image_timeout": 40, "wait_after": 0.25}
-        ))
-
-        # Шаг 59: Открытие вкладки корабля
-        steps.append(TutorialStep(
-            step_number=59,
-            description="Ждем изображения step_60, когда находим кликаем 125:283 (Открываем вкладку корабля)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_60", "x": 125, "y": 283, "image_timeout": 40, "wait_after": 1}
-        ))
-
-        # Шаг 60: Открытие вкладки построек
-        steps.append(TutorialStep(
-            step_number=60,
-            description="Ждем изображения step_61, когда находим кликаем 42:479 (заходим во вкладку построек)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_61", "x": 42, "y": 479, "image_timeout": 40, "wait_after": 1}
-        ))
-
-        # Шаг 61: Выбор корабля для улучшения
-        steps.append(TutorialStep(
-            step_number=61,
-            description="Ждем изображения step_62, когда находим кликаем 127:216 (Выбираем корабль для улучшения)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_62", "x": 127, "y": 216, "image_timeout": 40, "wait_after": 1}
-        ))
-
-        # Шаг 62: Улучшение корабля
-        steps.append(TutorialStep(
-            step_number=62,
-            description="Ждем изображения step_63, когда находим кликаем 1079:646, тайм слип 2.5 сек (Улучшаем корабль)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_63", "x": 1079, "y": 646, "image_timeout": 40, "wait_after": 3.5}
-        ))
-
-        # Шаг 63: Выход из вкладки корабля
-        steps.append(TutorialStep(
-            step_number=63,
-            description="клик 145:25 (Выходим из вкладки корабля)",
-            action_type="click_coord_with_delay_and_wait",
-            params={"x": 145, "y": 25, "delay": 0, "wait_after": 2}
-        ))
-
-        # Шаг 64: Открытие меню постройки
-        steps.append(TutorialStep(
-            step_number=64,
-            description="Ждем изображения step_61, когда находим кликаем 639:603 (Открываем меню постройки)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_61", "x": 639, "y": 603, "image_timeout": 40, "wait_after": 1}
-        ))
-
-        # Шаг 65: Пропустить
-        steps.append(TutorialStep(
-            step_number=65,
-            description="Ждем изображения step_21, когда находим кликаем 1169:42 (скип)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_21", "x": 1169, "y": 42, "image_timeout": 40, "wait_after": 1}
-        ))
-
-        # Шаг 66: Открытие компаса
-        steps.append(TutorialStep(
-            step_number=66,
-            description="Ждем изображения step_61, когда находим кликаем 1072:87, тайм слип 3 (Открываем вкладку компаса)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_61", "x": 1072, "y": 87, "image_timeout": 40, "wait_after": 9}
-        ))
-
-        # Шаг 67: Открытие вкладки строительства
-        steps.append(TutorialStep(
-            step_number=67,
-            description="Ждем изображения step_68, когда находим кликаем 43:481 (открываем вкладку строительства)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_68", "x": 43, "y": 481, "image_timeout": 40, "wait_after": 2}
-        ))
-
-        # Шаг 68: Выбор постройки
-        steps.append(TutorialStep(
-            step_number=68,
-            description="Ждем изображения step_69, когда находим кликаем 983:405 (выбираем постройку - каюта гребцов)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_69", "x": 983, "y": 405, "image_timeout": 40, "wait_after": 2.5}
-        ))
-
-        # Шаг 69: Подтверждение постройки
-        steps.append(TutorialStep(
-            step_number=69,
-            description="Ждем изображения step_68, когда находим кликаем 676:580, тайм слип 4.5 сек (Подтверждаем постройку каюты гребцов)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_68", "x": 676, "y": 580, "image_timeout": 40, "wait_after": 4.5}
-        ))
-
-        # Шаг 70: Активация квеста
-        steps.append(TutorialStep(
-            step_number=70,
-            description="клик 123:280, тайм слип 3 сек (Активируем квест 'Заполучи кают гребцов: 1')",
-            action_type="click_coord_with_delay_and_wait",
-            params={"x": 123, "y": 280, "delay": 0, "wait_after": 3.0}
-        ))
-
-        # Шаг 71: Открытие вкладки построек
-        steps.append(TutorialStep(
-            step_number=71,
-            description="клик 42:479 (открываем вкладку построек)",
-            action_type="click_coord_with_delay_and_wait",
-            params={"x": 42, "y": 479, "delay": 0, "wait_after": 3}
-        ))
-
-        # Шаг 72: Выбор орудийной палубы
-        steps.append(TutorialStep(
-            step_number=72,
-            description="Ждем изображения step_69, когда находим кликаем 687:514 (Выбираем орудийную палубу)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_69", "x": 687, "y": 514, "image_timeout": 40, "wait_after": 3}
-        ))
-
-        # Шаг 73: Подтверждение постройки орудийной палубы
-        steps.append(TutorialStep(
-            step_number=73,
-            description="Ждем изображения step_68, когда находим кликаем 679:581, тайм слип 4.5 сек (Подтверждаем постройку орудийной палубы)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_68", "x": 679, "y": 581, "image_timeout": 40, "wait_after": 5.5}
-        ))
-
-        # Шаг 74: Завершение квеста орудийных палуб
-        steps.append(TutorialStep(
-            step_number=74,
-            description="клик 119:279, тайм слип 2 сек (Завершаем квест орудийных палуб)",
-            action_type="click_coord_with_delay_and_wait",
-            params={"x": 119, "y": 279, "delay": 0, "wait_after": 3.5}
-        ))
-
-        # Шаг 75: Нажимаем на квест с компасом
-        steps.append(TutorialStep(
-            step_number=75,
-            description="клик 119:279, тайм слип 2 сек (Нажимаем на квест с компасом)",
-            action_type="click_coord_with_delay_and_wait",
-            params={"x": 119, "y": 279, "delay": 0, "wait_after": 1.5}
-        ))
-
-        # Шаг 76: Открытие компаса
-        steps.append(TutorialStep(
-            step_number=76,
-            description="клик 1072:87 (Открываем компас)",
-            action_type="click_coord_with_delay_and_wait",
-            params={"x": 1072, "y": 87, "delay": 0, "wait_after": 2}
-        ))
-
-        # Шаг 77: Активация указателя
-        steps.append(TutorialStep(
-            step_number=77,
-            description="Ждем изображения step_77, когда находим кликаем 698:273 (Активируем указатель)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_77", "x": 698, "y": 273, "image_timeout": 40, "wait_after": 2}
-        ))
-
-        # Шаг 78: Пропустить
-        steps.append(TutorialStep(
-            step_number=78,
-            description="Ждем изображения step_27, когда находим кликаем 1169:42 (скип)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_27", "x": 1169, "y": 42, "image_timeout": 40, "wait_after": 1}
-        ))
-
-        # Шаг 79: Активация компаса над кораблем
-        steps.append(TutorialStep(
-            step_number=79,
-            description="Ждем изображения step_79, когда находим кликаем 652:214 (Активируем компас над кораблем)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_79", "x": 652, "y": 214, "image_timeout": 40, "wait_after": 0.25}
-        ))
-
-        # Шаг 80: Пропустить
-        steps.append(TutorialStep(
-            step_number=80,
-            description="Ждем изображения step_27, когда находим кликаем 1169:42 (скип)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_27", "x": 1169, "y": 42, "image_timeout": 40, "wait_after": 4.5}
-        ))
-
-        # Шаг 81: Пропустить
-        steps.append(TutorialStep(
-            step_number=81,
-            description="Ждем изображения step_21, когда находим кликаем 1169:42, тайм слип 1 сек (скип)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_21", "x": 1169, "y": 42, "image_timeout": 40, "wait_after": 1.5}
-        ))
-
-        # Шаг 82: Пропустить
-        steps.append(TutorialStep(
-            step_number=82,
-            description="Ждем изображения step_21, когда находим кликаем 1169:42, тайм слип 1 сек (скип)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_21", "x": 1169, "y": 42, "image_timeout": 40, "click_delay": 1.5,
-                    "wait_after": 1.5}
-        ))
-
-        # Шаг 83: Активация квеста "Богатая добыча"
-        steps.append(TutorialStep(
-            step_number=83,
-            description="Ждем изображения step_82, когда находим кликаем 151:280 (Активируем квест 'Богатая добыча')",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_82", "x": 151, "y": 280, "image_timeout": 40, "wait_after": 0.25}
-        ))
-
-        # Шаг 84: Пропустить
-        steps.append(TutorialStep(
-            step_number=84,
-            description="Ждем изображения step_27, когда находим кликаем 1169:42 (скип)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_27", "x": 1169, "y": 42, "image_timeout": 40, "wait_after": 0.5}
-        ))
-
-        # Шаг 85: Пропустить
-        steps.append(TutorialStep(
-            step_number=85,
-            description="Ждем изображения step_84, когда находим кликаем 1169:42 (скип)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_84", "x": 1169, "y": 42, "image_timeout": 40, "wait_after": 0.25}
-        ))
-
-        # Шаг 86: Пропустить
-        steps.append(TutorialStep(
-            step_number=86,
-            description="Ждем изображения step_85, когда находим кликаем 1169:42, тайм слип 1 сек (скип)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_85", "x": 1169, "y": 42, "image_timeout": 40, "wait_after": 2.0}
-        ))
-
-        # Шаг 87: Пропустить
-        steps.append(TutorialStep(
-            step_number=87,
-            description="Ждем изображения step_85, когда находим кликаем 1169:42 (скип)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_85", "x": 1169, "y": 42, "image_timeout": 40, "wait_after": 2.0}
-        ))
-
-        # Шаг 88: Сбор монет
-        steps.append(TutorialStep(
-            step_number=88,
-            description="Ждем изображения step_87, когда находим кликаем 931:620 (Собираем монеты)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_87", "x": 931, "y": 620, "image_timeout": 40, "wait_after": 2.0}
-        ))
-
-        # Шаг 89: Пропустить
-        steps.append(TutorialStep(
-            step_number=89,
-            description="Ждем изображения step_88, когда находим кликаем 1169:42 (скип)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_88", "x": 1169, "y": 42, "image_timeout": 40, "wait_after": 1.0}
-        ))
-
-        # Шаг 90: Пропустить
-        steps.append(TutorialStep(
-            step_number=90,
-            description="Ждем изображения step_89, когда находим кликаем 150:277 (скип)",
-            action_type="click_with_image_check_and_wait",
-            params={"image_key": "step_89", "x": 150, "y": 277, "image_timeout": 40, "wait_after": 0.25}
-        ))
-
-        return steps
+        return list(self.iter_steps_from_range(start_step, end_step))
 
-    def get_steps_from_range(self, start_step: int, end_step: int = 97) -> List[TutorialStep]:
+    def iter_steps_from_range(self, start_step: int, end_step: int = 97) -> Iterator[TutorialStep]:
         """
-        Получение шагов в указанном диапазоне.
+        Перебор шагов в указанном диапазоне без построения списка.
 
         Args:
             start_step: начальный шаг
             end_step: конечный шаг
 
         Returns:
-            list: список шагов в диапазоне
+            Iterator: шаги в диапазоне по возрастанию номера
         """
-        return [step for step in self._steps
-                if start_step <= step.step_number <= end_step]
+        numbers = self._sorted_numbers
+        start = bisect.bisect_left(numbers, start_step)
+        end = bisect.bisect_right(numbers, end_step)
+        by_number = self._by_number
+        return (by_number[number] for number in numbers[start:end])
 
     def get_step_by_number(self, step_number: int) -> Optional[TutorialStep]:
         """
@@ -775,19 +575,58 @@ class TutorialSteps:
         Returns:
             TutorialStep: шаг или None если не найден
         """
-        for step in self._steps:
-            if step.step_number == step_number:
-                return step
-        return None
+        return self._by_number.get(step_number)
 
-    def get_all_steps(self) -> List[TutorialStep]:
+    def get_steps_by_action(self, action_type: str) -> List[TutorialStep]:
         """
-        Получение всех шагов.
+        Получение шагов с указанным типом действия.
+
+        Args:
+            action_type: тип действия
 
         Returns:
-            list: список всех шагов
+            list: шаги этого типа в порядке определения (пустой, если таких нет)
+        """
+        return list(self._by_action.get(action_type, ()))
+
+    def get_steps_by_image_key(self, image_key: str) -> List[TutorialStep]:
         """
-        return self._steps.copy()
+        Получение шагов, ожидающих указанное изображение.
+
+        Args:
+            image_key: ключ изображения в IMAGE_PATHS
+
+        Returns:
+            list: шаги с этим изображением в порядке определения (пустой, если таких нет)
+        """
+        return list(self._by_image.get(image_key, ()))
+
+    def get_all_image_keys(self) -> FrozenSet[str]:
+        """
+        Получение ключей всех изображений, используемых в шагах (для предзагрузки шаблонов).
+
+        Returns:
+            frozenset: ключи изображений в IMAGE_PATHS
+        """
+        return self._image_keys
+
+    def get_all_steps(self) -> Tuple[TutorialStep, ...]:
+        """
+        Получение всех шагов (без копирования, только для чтения).
+
+        Returns:
+            tuple: все шаги
+        """
+        return self._steps
+
+    def get_all_steps_mutable(self) -> List[TutorialStep]:
+        """
+        Получение всех шагов в виде списка, который можно изменять.
+
+        Returns:
+            list: копия списка всех шагов
+        """
+        return list(self._steps)
 
     def validate_steps(self) -> bool:
         """
@@ -796,19 +635,30 @@ class TutorialSteps:
         Returns:
             bool: True если все шаги корректны
         """
-        step_numbers = [step.step_number for step in self._steps]
+        # Проверка на дубликаты за один проход
+        step_numbers = set()
+        for step in self._steps:
+            if step.step_number in step_numbers:
+                logger.error("Найдены дублирующиеся номера шагов")
+                return False
+            step_numbers.add(step.step_number)
+
+        # Проверка типов действий
+        unknown = sorted({step.action_type for step in self._steps if step.action_id == UNKNOWN_ACTION_ID})
+        if unknown:
+            logger.error(f"Неизвестные типы действий в шагах: {unknown}")
+            return False
 
-        # Проверка на дубликаты
-        if len(step_numbers) != len(set(step_numbers)):
-            self.logger.error("Найдены дублирующиеся номера шагов")
+        # Проверка обязательных параметров (результат вычислен при импорте)
+        if _MISSING_PARAMS:
+            for step_number, missing in _MISSING_PARAMS:
+                logger.error(f"Шаг {step_number}: отсутствуют обязательные параметры {missing}")
             return False
 
         # Проверка последовательности (с учетом пропущенных шагов)
-        step_numbers.sort()
-        expected_steps = set(range(1, 98))  # Шаги 1-97
-        missing_steps = expected_steps - set(step_numbers)
+        missing_steps = _EXPECTED_STEPS - step_numbers
 
         if missing_steps:
-            self.logger.warning(f"Отсутствуют шаги: {sorted(missing_steps)}")
+            logger.warning(f"Отсутствуют шаги: {sorted(missing_steps)}")
 
         return True
\ No newline at end of file
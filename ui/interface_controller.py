@@ -3,7 +3,9 @@
 """
 import time
 import logging
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
+
+from config import IMAGE_PATHS, GAME_PACKAGE, GAME_ACTIVITY, LOADING_TIMEOUT
 
 
 class InterfaceController:
@@ -32,7 +34,7 @@ class InterfaceController:
         self.logger.debug(f"Клик по координатам ({x}, {y})")
         self.adb.tap(x, y)
 
-    def click_coord_with_delay(self, x: int, y: int, delay: float = 0.0) -> None:
+    def click_coord_with_delay(self, x: int, y: int, delay: float = 0.0, pause_after: float = 0.0) -> None:
         """
         Клик по координатам с задержкой.
 
@@ -40,12 +42,29 @@ class InterfaceController:
             x: координата x
             y: координата y
             delay: задержка перед кликом в секундах
+            pause_after: пауза после клика в секундах; если задана, обе паузы
+                         и клик выполняются на устройстве одним вызовом ADB
         """
+        if pause_after > 0:
+            self.click_batch([(x, y, delay)], pause_after)
+            return
+
         if delay > 0:
             self.logger.debug(f"Ожидание {delay} сек перед кликом по ({x}, {y})")
             time.sleep(delay)
         self.click_coord(x, y)
 
+    def click_batch(self, points: List[Tuple[int, int, float]], pause_after: float = 0.0) -> None:
+        """
+        Серия кликов по координатам одним вызовом ADB.
+
+        Args:
+            points: список (x, y, задержка перед кликом в секундах)
+            pause_after: пауза после последнего клика в секундах
+        """
+        self.logger.debug(f"Серия кликов: {points}")
+        self.adb.tap_sequence(points, pause_after)
+
     def click_image(self, image_key: str, timeout: int = 30) -> bool:
         """
         Поиск и клик по изображению.
@@ -57,14 +76,32 @@ class InterfaceController:
         Returns:
             bool: True если изображение найдено и клик выполнен
         """
-        from config import IMAGE_PATHS
-
         if image_key not in IMAGE_PATHS:
             self.logger.error(f"Изображение '{image_key}' не найдено в конфигурации")
             return False
 
         return self.image.tap_on_template(IMAGE_PATHS[image_key], timeout)
 
+    def preload_template(self, image_key: str) -> bool:
+        """
+        Загрузка шаблона изображения и его пирамиды в кэш заранее, до его ожидания на экране.
+
+        Args:
+            image_key: ключ изображения в IMAGE_PATHS
+
+        Returns:
+            bool: True если шаблон загружен (или уже был в кэше)
+        """
+        if image_key not in IMAGE_PATHS:
+            return False
+
+        try:
+            self.image.load_template_pyramid(IMAGE_PATHS[image_key])
+            return True
+        except Exception as e:
+            self.logger.debug(f"Не удалось заранее загрузить шаблон '{image_key}': {e}")
+            return False
+
     def wait_for_image(self, image_key: str, timeout: int = 30) -> Optional[Tuple[int, int, int, int]]:
         """
         Ожидание появления изображения.
@@ -76,8 +113,6 @@ class InterfaceController:
         Returns:
             tuple: координаты найденного изображения или None
         """
-        from config import IMAGE_PATHS
-
         if image_key not in IMAGE_PATHS:
             self.logger.error(f"Изображение '{image_key}' не найдено в конфигурации")
             return None
@@ -85,7 +120,8 @@ class InterfaceController:
         return self.image.wait_for_template(IMAGE_PATHS[image_key], timeout)
 
     def click_with_image_check(self, image_key: str, x: int, y: int,
-                               image_timeout: int = 15, click_delay: float = 0.0) -> bool:
+                               image_timeout: int = 15, click_delay: float = 0.0,
+                               pause_after: float = 0.0) -> bool:
         """
         Комбинированный метод: ждет изображение и выполняет клик по координатам.
 
@@ -95,17 +131,18 @@ class InterfaceController:
             y: координата y для клика
             image_timeout: таймаут ожидания изображения
             click_delay: задержка перед кликом
+            pause_after: пауза после клика, выполняемая на устройстве
 
         Returns:
             bool: True если изображение найдено
         """
         if self.wait_for_image(image_key, timeout=image_timeout):
             self.logger.info(f"Изображение {image_key} найдено, выполняем клик по ({x}, {y})")
-            self.click_coord_with_delay(x, y, click_delay)
+            self.click_coord_with_delay(x, y, click_delay, pause_after)
             return True
         else:
             self.logger.warning(f"Изображение {image_key} не найдено, выполняем клик по координатам")
-            self.click_coord_with_delay(x, y, click_delay)
+            self.click_coord_with_delay(x, y, click_delay, pause_after)
             return False
 
     def perform_swipe(self, start_x: int, start_y: int, end_x: int, end_y: int,
@@ -130,15 +167,11 @@ class InterfaceController:
 
     def start_app(self) -> None:
         """Запуск игры."""
-        from config import GAME_PACKAGE, GAME_ACTIVITY, LOADING_TIMEOUT
-
         self.logger.info("Запуск игры")
         self.adb.start_app(GAME_PACKAGE, GAME_ACTIVITY)
         time.sleep(LOADING_TIMEOUT)
 
     def stop_app(self) -> None:
         """Остановка игры."""
-        from config import GAME_PACKAGE
-
         self.logger.info("Остановка игры")
         self.adb.stop_app(GAME_PACKAGE)
\ No newline at end of file
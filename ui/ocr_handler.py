@@ -3,14 +3,35 @@
 """
 import cv2
 import numpy as np
+import hashlib
 import logging
+import threading
 import time
+from collections import OrderedDict
 from typing import Optional, Tuple
 
 
 class OCRHandler:
     """Класс для работы с распознаванием текста и поиска элементов по тексту."""
 
+    # Размер кэша результатов распознавания (по хешу пикселей области)
+    TEXT_CACHE_SIZE = 128
+
+    # Опрос экрана при поиске текста: пауза растет, пока область не меняется
+    POLL_MIN_DELAY = 0.1
+    POLL_MAX_DELAY = 1.0
+    POLL_BACKOFF = 1.5
+
+    # Отступ между вариантами бинаризации в склеенном изображении
+    TILE_GAP = 10
+
+    # Наибольшая сторона области для OCR: время Tesseract растет с числом пикселей,
+    # а текст интерфейса читается и на уменьшенном изображении
+    OCR_MAX_SIDE = 1000
+
+    # Языки распознавания текста
+    OCR_LANGUAGE = 'rus+eng'
+
     def __init__(self, adb_controller):
         """
         Инициализация обработчика OCR.
@@ -22,6 +43,17 @@ class OCRHandler:
         self.adb = adb_controller
         self.ocr_available = self._check_ocr_availability()
 
+        # Результаты распознавания: (текст, область, md5 пикселей) -> найден ли текст,
+        # (None, область, md5 пикселей) -> текст области.
+        # Одинаковые пиксели дают одинаковый результат OCR, повторное распознавание не нужно
+        self._text_cache = OrderedDict()
+
+        # Постоянный экземпляр Tesseract (tesserocr) создается при первом распознавании;
+        # один экземпляр не может распознавать два изображения одновременно
+        self._tess = None
+        self._tess_checked = False
+        self._tess_lock = threading.Lock()
+
     def _check_ocr_availability(self) -> bool:
         """Проверка доступности OCR."""
         try:
@@ -31,8 +63,64 @@ class OCRHandler:
             self.logger.warning("OCR не доступен - pytesseract не установлен")
             return False
 
+    def _get_tess_api(self):
+        """
+        Получение постоянного экземпляра Tesseract через tesserocr (создается один раз).
+
+        Returns:
+            PyTessBaseAPI или None, если tesserocr не установлен
+        """
+        if self._tess_checked:
+            return self._tess
+        self._tess_checked = True
+
+        try:
+            from tesserocr import PyTessBaseAPI
+        except ImportError:
+            self.logger.debug("tesserocr не установлен, распознавание через pytesseract")
+            return None
+
+        try:
+            self._tess = PyTessBaseAPI(lang=self.OCR_LANGUAGE)
+        except Exception as e:
+            self.logger.warning(f"Не удалось инициализировать tesserocr, используется pytesseract: {e}")
+        return self._tess
+
+    def _recognize_text(self, image: np.ndarray) -> str:
+        """
+        Распознавание текста на одноканальном изображении.
+
+        Модели tesserocr загружаются один раз; без tesserocr каждый вызов
+        запускает процесс tesseract через pytesseract.
+
+        Args:
+            image: одноканальное изображение
+
+        Returns:
+            str: распознанный текст
+        """
+        with self._tess_lock:
+            tess = self._get_tess_api()
+            if tess is not None:
+                image = np.ascontiguousarray(image)
+                height, width = image.shape[:2]
+                tess.SetImageBytes(image.tobytes(), width, height, 1, width)
+                return tess.GetUTF8Text()
+
+        import pytesseract
+        return pytesseract.image_to_string(image, lang=self.OCR_LANGUAGE)
+
+    def close(self):
+        """Освобождение экземпляра Tesseract."""
+        with self._tess_lock:
+            if self._tess is not None:
+                self._tess.End()
+                self._tess = None
+            self._tess_checked = False
+
     def find_text_on_screen(self, text: str, region: Optional[Tuple[int, int, int, int]] = None,
-                           timeout: Optional[int] = None) -> Optional[Tuple[int, int, int, int]]:
+                           timeout: Optional[int] = None,
+                           volatile_region: bool = False) -> Optional[Tuple[int, int, int, int]]:
         """
         Поиск текста на экране с использованием OCR.
 
@@ -40,6 +128,7 @@ class OCRHandler:
             text: искомый текст
             region: область поиска (x, y, w, h)
             timeout: время ожидания
+            volatile_region: область анимирована - результаты распознавания не кэшируются
 
         Returns:
             tuple: координаты найденного текста (x, y, w, h) или None
@@ -48,10 +137,13 @@ class OCRHandler:
             return None
 
         start_time = time.time()
+        delay = self.POLL_MIN_DELAY
+        previous_roi = None
         while timeout is None or time.time() - start_time < timeout:
             screenshot = self.adb.screenshot()
             if screenshot is None:
-                time.sleep(0.5)
+                time.sleep(delay)
+                delay = min(delay * self.POLL_BACKOFF, self.POLL_MAX_DELAY)
                 continue
 
             # Определяем область поиска
@@ -64,17 +156,23 @@ class OCRHandler:
                 offset_x, offset_y = 0, 0
 
             # Поиск текста
-            if self._find_text_in_image(roi, text):
+            if self._find_text_cached(roi, text, region, volatile_region):
                 center_x = offset_x + roi.shape[1] // 2
                 center_y = offset_y + roi.shape[0] // 2
                 return (center_x, center_y, roi.shape[1], roi.shape[0])
 
-            time.sleep(0.5)
+            # Пока область не меняется, опрос замедляется; изменение области - снова частый опрос
+            if previous_roi is not None and not np.array_equal(previous_roi, roi):
+                delay = self.POLL_MIN_DELAY
+            previous_roi = roi
+
+            time.sleep(delay)
+            delay = min(delay * self.POLL_BACKOFF, self.POLL_MAX_DELAY)
 
         return None
 
     def find_and_click_text(self, text: str, region: Optional[Tuple[int, int, int, int]] = None,
-                          timeout: Optional[int] = None) -> bool:
+                          timeout: Optional[int] = None, volatile_region: bool = False) -> bool:
         """
         Поиск и клик по тексту.
 
@@ -82,17 +180,92 @@ class OCRHandler:
             text: искомый текст
             region: область поиска
             timeout: время ожидания
+            volatile_region: область анимирована - результаты распознавания не кэшируются
 
         Returns:
             bool: True если текст найден и клик выполнен
         """
-        result = self.find_text_on_screen(text, region, timeout)
+        result = self.find_text_on_screen(text, region, timeout, volatile_region)
         if result:
             x, y, _, _ = result
             self.adb.tap(x, y)
             return True
         return False
 
+    def _find_text_cached(self, image: np.ndarray, target_text: str,
+                          region: Optional[Tuple[int, int, int, int]], volatile_region: bool) -> bool:
+        """
+        Поиск текста в изображении с кэшированием результата по хешу пикселей.
+
+        Args:
+            image: изображение для поиска
+            target_text: искомый текст
+            region: область поиска (часть ключа кэша)
+            volatile_region: не использовать кэш
+
+        Returns:
+            bool: True если текст найден
+        """
+        if volatile_region:
+            return self._find_text_in_image(image, target_text)
+
+        key = (target_text, region, self._pixels_digest(image))
+        if key in self._text_cache:
+            self._text_cache.move_to_end(key)
+            return self._text_cache[key]
+
+        found = self._find_text_in_image(image, target_text)
+        self._remember(key, found)
+        return found
+
+    @staticmethod
+    def _pixels_digest(image: np.ndarray) -> bytes:
+        """
+        Хеш пикселей изображения для ключа кэша распознавания.
+
+        Args:
+            image: изображение
+
+        Returns:
+            bytes: md5 пикселей
+        """
+        return hashlib.md5(np.ascontiguousarray(image).tobytes()).digest()
+
+    def _remember(self, key: tuple, value):
+        """
+        Сохранение результата распознавания в кэш с вытеснением самых старых записей.
+
+        Args:
+            key: ключ (текст или None, область, хеш пикселей)
+            value: результат распознавания
+        """
+        self._text_cache[key] = value
+        if len(self._text_cache) > self.TEXT_CACHE_SIZE:
+            self._text_cache.popitem(last=False)
+
+    def clear_text_cache(self):
+        """Очистка кэша результатов распознавания (например, при смене экрана или сервера)."""
+        self._text_cache.clear()
+
+    def _prepare_gray(self, image: np.ndarray) -> np.ndarray:
+        """
+        Перевод области в оттенки серого с уменьшением больших изображений.
+
+        Args:
+            image: изображение BGR или уже серое
+
+        Returns:
+            np.ndarray: непрерывное серое изображение uint8
+        """
+        gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+        longest = max(gray.shape[:2])
+        if longest > self.OCR_MAX_SIDE:
+            scale = self.OCR_MAX_SIDE / longest
+            gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+        return np.ascontiguousarray(gray)
+
     def _find_text_in_image(self, image: np.ndarray, target_text: str) -> bool:
         """
         Поиск текста в изображении.
@@ -105,26 +278,24 @@ class OCRHandler:
             bool: True если текст найден
         """
         try:
-            import pytesseract
-
             # Предобработка изображения
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            gray = self._prepare_gray(image)
 
-            # Несколько методов обработки для повышения точности
+            # Несколько методов обработки для повышения точности; варианты склеиваются
+            # друг под другом, и весь набор распознается одним вызовом OCR
             methods = [
                 cv2.threshold(gray, 150, 255, cv2.THRESH_BINARY_INV)[1],
                 cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
                                     cv2.THRESH_BINARY_INV, 11, 2)
             ]
-
-            # Проверяем каждый метод
-            target_lower = target_text.lower()
-            for processed in methods:
-                result = pytesseract.image_to_string(processed, lang='rus+eng')
-                if target_lower in result.lower():
-                    return True
-
-            return False
+            # Отступ продолжает фон каждого варианта, чтобы строки вариантов не сливались
+            stacked = np.vstack([
+                cv2.copyMakeBorder(processed, 0, self.TILE_GAP, 0, 0, cv2.BORDER_REPLICATE)
+                for processed in methods
+            ])
+
+            result = self._recognize_text(stacked)
+            return target_text.lower() in result.lower()
         except Exception as e:
             self.logger.error(f"Ошибка поиска текста: {e}")
             return False
@@ -143,8 +314,6 @@ class OCRHandler:
             return ""
 
         try:
-            import pytesseract
-
             screenshot = self.adb.screenshot()
             if screenshot is None:
                 return ""
@@ -152,13 +321,20 @@ class OCRHandler:
             x, y, w, h = region
             roi = screenshot[y:y + h, x:x + w]
 
+            # Те же пиксели области дают тот же текст
+            key = (None, region, self._pixels_digest(roi))
+            if key in self._text_cache:
+                self._text_cache.move_to_end(key)
+                return self._text_cache[key]
+
             # Предобработка
-            gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
+            gray = self._prepare_gray(roi)
             _, binary = cv2.threshold(gray, 150, 255, cv2.THRESH_BINARY)
 
             # Распознавание
-            text = pytesseract.image_to_string(binary, lang='rus+eng')
-            return text.strip()
+            text = self._recognize_text(binary).strip()
+            self._remember(key, text)
+            return text
 
         except Exception as e:
             self.logger.error(f"Ошибка получения текста: {e}")
@@ -6,13 +6,24 @@
 import cv2
 import numpy as np
 import re
+import hashlib
 import logging
 import time
+from collections import OrderedDict
 from typing import Optional, List, Tuple, Dict
 from pathlib import Path
 
 from config import SEASONS, COORDINATES, PAUSE_SETTINGS, OCR_REGIONS, SERVER_RECOGNITION_SETTINGS
 
+# Известные сезоны в порядке приоритета при разборе текста
+KNOWN_SEASONS = ("S1", "S2", "S3", "S4", "S5", "X1", "X2", "X3", "X4")
+_SEASON_PRIORITY = {season: index for index, season in enumerate(KNOWN_SEASONS)}
+
+# Все варианты написания сезонов одним выражением: текст просматривается за один проход
+# вместо перебора пар (сезон, вариант написания). Текст к этому моменту уже в верхнем
+# регистре, а кириллические С/Х заменены на латинские.
+_SEASON_TOKEN_RE = re.compile(r'S[1-5]|[X×][1-4]')
+
 
 class OptimizedServerSelector:
     """
@@ -40,6 +51,15 @@ class OptimizedServerSelector:
         self.last_seasons_screenshot_time = 0  # Время последнего скриншота сезонов
         self.cache_timeout = 1.0  # Таймаут кеша в секундах
 
+        # Результаты OCR серверов по хешу пикселей области: после скролла, который не
+        # сдвинул список, распознавание не повторяется (ключ включает текущий сезон)
+        self._servers_by_hash = OrderedDict()
+        self._servers_by_hash_size = 32
+
+        # Объекты OpenCV, переиспользуемые между вызовами предобработки
+        self._clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+        self._morph_kernel = np.ones((2, 2), np.uint8)
+
         # Создаем директорию для отладочных скриншотов
         if self.debug_mode:
             self.debug_dir = Path("debug_seasons")
@@ -345,14 +365,11 @@ class OptimizedServerSelector:
         processed.append(("blurred_adaptive", binary_blurred, 1))
 
         # 2. Морфологические операции
-        kernel = np.ones((2, 2), np.uint8)
-        eroded = cv2.erode(binary, kernel, iterations=1)
-        dilated = cv2.dilate(eroded, kernel, iterations=1)
-        processed.append(("morphology", dilated, 1))
+        opened = cv2.morphologyEx(binary, cv2.MORPH_OPEN, self._morph_kernel)
+        processed.append(("morphology", opened, 1))
 
         # 3. CLAHE (Contrast Limited Adaptive Histogram Equalization)
-        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-        clahe_img = clahe.apply(gray)
+        clahe_img = self._clahe.apply(gray)
         _, binary_clahe = cv2.threshold(clahe_img, 150, 255, cv2.THRESH_BINARY_INV)
         processed.append(("clahe", binary_clahe, 1))
 
@@ -423,35 +440,17 @@ class OptimizedServerSelector:
         # Проверка на прямое совпадение для коротких текстов
         normalized_text = text.upper().strip()
 
-        # Набор известных сезонов
-        known_seasons = ["S1", "S2", "S3", "S4", "S5", "X1", "X2", "X3", "X4"]
-
         # Замены похожих символов
         normalized_text = normalized_text.replace('С', 'S')  # Кириллическая С → S
         normalized_text = normalized_text.replace('Х', 'X')  # Кириллическая Х → X
-        normalized_text = normalized_text.replace('с', 'S')  # Кириллическая с → S
-        normalized_text = normalized_text.replace('х', 'X')  # Кириллическая х → X
 
-        # Явная проверка на сезоны
-        for season in known_seasons:
-            # Проверка для S сезонов
-            if season.startswith('S') and season in normalized_text:
-                if self.debug_mode:
-                    self.logger.debug(f"Найден точный сезон S: '{text}' → '{season}'")
-                return [season]
-
-            # Специальные проверки для X сезонов, которые часто путаются
-            if season.startswith('X'):
-                # Различные варианты написания X
-                patterns = ['X', 'Х', '×', 'x', 'х']
-                digit = season[1]
-
-                for pattern in patterns:
-                    if f"{pattern}{digit}" in normalized_text:
-                        correct_season = f"X{digit}"
-                        if self.debug_mode:
-                            self.logger.debug(f"Найден X сезон: '{text}' → '{correct_season}'")
-                        return [correct_season]
+        # Явная проверка на сезоны (X сезоны часто распознаются как ×)
+        tokens = {token.replace('×', 'X') for token in _SEASON_TOKEN_RE.findall(normalized_text)}
+        if tokens:
+            season = min(tokens, key=_SEASON_PRIORITY.__getitem__)
+            if self.debug_mode:
+                self.logger.debug(f"Найден точный сезон: '{text}' → '{season}'")
+            return [season]
 
         # Если до сих пор не нашли сезон, пробуем искать по цифрам
         # Есть риск путаницы из-за номеров серверов, поэтому оставляем как запасной вариант
@@ -463,7 +462,7 @@ class OptimizedServerSelector:
                 else:
                     season_id = f"S{digit}"
 
-                if season_id in known_seasons:
+                if season_id in _SEASON_PRIORITY:
                     if self.debug_mode:
                         self.logger.debug(f"Найден сезон по цифре: '{text}' → '{season_id}'")
                     return [season_id]
@@ -701,6 +700,15 @@ class OptimizedServerSelector:
             x, y, w, h = OCR_REGIONS['servers']
             roi = screenshot[y:y + h, x:x + w]
 
+            # Та же картинка области уже распознавалась - OCR даст тот же результат
+            roi_key = (hashlib.md5(np.ascontiguousarray(roi).tobytes()).digest(), self.current_season)
+            if roi_key in self._servers_by_hash:
+                self._servers_by_hash.move_to_end(roi_key)
+                self.cached_servers = self._servers_by_hash[roi_key]
+                self.last_screenshot_time = current_time
+                self.logger.debug("Область серверов не изменилась, используем прошлый результат OCR")
+                return self.cached_servers
+
             # Обработка изображения
             servers_with_coords = {}
             processed_images = self._preprocess_image(roi, w, h)
@@ -725,6 +733,9 @@ class OptimizedServerSelector:
             # Обновляем кеш и время
             self.cached_servers = sorted_servers
             self.last_screenshot_time = current_time
+            self._servers_by_hash[roi_key] = sorted_servers
+            if len(self._servers_by_hash) > self._servers_by_hash_size:
+                self._servers_by_hash.popitem(last=False)
 
             if sorted_servers:
                 # Логируем только если результат отличается от предыдущего